@@ -3,7 +3,7 @@
 import { useEffect, useState } from "react";
 import { PortalShell } from "../../../components/portal/PortalShell";
 import { Modal } from "../../../components/portal/Modal";
-import { apiFetch } from "../../../lib/api";
+import { apiFetch, apiFetchPage } from "../../../lib/api";
 import type { Partner } from "../../../lib/types";
 
 const NAV_LINKS = [
@@ -23,6 +23,8 @@ type BenefitPayload = {
 
 export default function PortalAdminBeneficiosPage() {
   const [partners, setPartners] = useState<Partner[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [form, setForm] = useState<BenefitPayload>({
     name: "",
     description: "",
@@ -34,10 +36,26 @@ export default function PortalAdminBeneficiosPage() {
 
   const loadPartners = async () => {
     try {
-      const data = await apiFetch<Partner[]>("/admin/partners");
-      setPartners(data);
+      const page = await apiFetchPage<Partner>("/admin/partners");
+      setPartners(page.items);
+      setNextCursor(page.nextCursor);
     } catch (err) {
       setPartners([]);
+      setNextCursor(null);
+    }
+  };
+
+  const loadMorePartners = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const page = await apiFetchPage<Partner>("/admin/partners", nextCursor);
+      setPartners((current) => [...current, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      setNextCursor(null);
+    } finally {
+      setLoadingMore(false);
     }
   };
 
@@ -201,6 +219,16 @@ export default function PortalAdminBeneficiosPage() {
               </div>
             ))}
           </div>
+          {nextCursor && (
+            <button
+              type="button"
+              onClick={loadMorePartners}
+              disabled={loadingMore}
+              className="mt-4 rounded-full border border-[#1f6dd1]/30 px-4 py-2 text-xs font-semibold uppercase tracking-[0.2em] text-[#1f6dd1] transition hover:bg-[#f2f6ff] disabled:opacity-60"
+            >
+              {loadingMore ? "Carregando..." : "Carregar mais"}
+            </button>
+          )}
         </div>
       </div>
 
@@ -3,7 +3,7 @@
 import { useEffect, useState } from "react";
 import { PortalShell } from "../../../components/portal/PortalShell";
 import { Modal } from "../../../components/portal/Modal";
-import { apiFetch } from "../../../lib/api";
+import { apiFetch, apiFetchPage } from "../../../lib/api";
 import type { Announcement } from "../../../lib/types";
 
 const NAV_LINKS = [
@@ -29,6 +29,8 @@ const getToday = () => {
 
 export default function PortalAdminComunicadosPage() {
   const [announcements, setAnnouncements] = useState<Announcement[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [form, setForm] = useState<AnnouncementPayload>({
     title: "",
     body: "",
@@ -40,10 +42,26 @@ export default function PortalAdminComunicadosPage() {
 
   const loadAnnouncements = async () => {
     try {
-      const data = await apiFetch<Announcement[]>("/admin/announcements");
-      setAnnouncements(data);
+      const page = await apiFetchPage<Announcement>("/admin/announcements");
+      setAnnouncements(page.items);
+      setNextCursor(page.nextCursor);
     } catch (err) {
       setAnnouncements([]);
+      setNextCursor(null);
+    }
+  };
+
+  const loadMoreAnnouncements = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const page = await apiFetchPage<Announcement>("/admin/announcements", nextCursor);
+      setAnnouncements((current) => [...current, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      setNextCursor(null);
+    } finally {
+      setLoadingMore(false);
     }
   };
 
@@ -218,6 +236,16 @@ export default function PortalAdminComunicadosPage() {
               </div>
             ))}
           </div>
+          {nextCursor && (
+            <button
+              type="button"
+              onClick={loadMoreAnnouncements}
+              disabled={loadingMore}
+              className="mt-4 rounded-full border border-[#1f6dd1]/30 px-4 py-2 text-xs font-semibold uppercase tracking-[0.2em] text-[#1f6dd1] transition hover:bg-[#f2f6ff] disabled:opacity-60"
+            >
+              {loadingMore ? "Carregando..." : "Carregar mais"}
+            </button>
+          )}
         </div>
       </div>
 
@@ -3,7 +3,7 @@
 import { useEffect, useState } from "react";
 import { PortalShell } from "../../../components/portal/PortalShell";
 import { Modal } from "../../../components/portal/Modal";
-import { apiFetch } from "../../../lib/api";
+import { apiFetch, apiFetchPage } from "../../../lib/api";
 import type { Course } from "../../../lib/types";
 
 const NAV_LINKS = [
@@ -23,6 +23,8 @@ type CoursePayload = {
 
 export default function PortalAdminCursosPage() {
   const [courses, setCourses] = useState<Course[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [form, setForm] = useState<CoursePayload>({
     title: "",
     description: "",
@@ -34,10 +36,26 @@ export default function PortalAdminCursosPage() {
 
   const loadCourses = async () => {
     try {
-      const data = await apiFetch<Course[]>("/admin/courses");
-      setCourses(data);
+      const page = await apiFetchPage<Course>("/admin/courses");
+      setCourses(page.items);
+      setNextCursor(page.nextCursor);
     } catch (err) {
       setCourses([]);
+      setNextCursor(null);
+    }
+  };
+
+  const loadMoreCourses = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const page = await apiFetchPage<Course>("/admin/courses", nextCursor);
+      setCourses((current) => [...current, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      setNextCursor(null);
+    } finally {
+      setLoadingMore(false);
     }
   };
 
@@ -224,6 +242,16 @@ export default function PortalAdminCursosPage() {
               </div>
             ))}
           </div>
+          {nextCursor && (
+            <button
+              type="button"
+              onClick={loadMoreCourses}
+              disabled={loadingMore}
+              className="mt-4 rounded-full border border-[#1f6dd1]/30 px-4 py-2 text-xs font-semibold uppercase tracking-[0.2em] text-[#1f6dd1] transition hover:bg-[#f2f6ff] disabled:opacity-60"
+            >
+              {loadingMore ? "Carregando..." : "Carregar mais"}
+            </button>
+          )}
         </div>
       </div>
 
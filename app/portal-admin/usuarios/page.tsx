@@ -3,7 +3,7 @@
 import { useEffect, useState } from "react";
 import { PortalShell } from "../../../components/portal/PortalShell";
 import { Modal } from "../../../components/portal/Modal";
-import { apiFetch } from "../../../lib/api";
+import { apiFetch, apiFetchPage } from "../../../lib/api";
 import type { User, UserRole } from "../../../lib/types";
 
 const NAV_LINKS = [
@@ -38,8 +38,31 @@ type BulkResult = {
   errors: { row: number; message: string }[];
 };
 
+type BulkJob = BulkResult & {
+  id: string;
+  status: "queued" | "running" | "done" | "failed";
+  detail: string | null;
+};
+
+const JOB_POLL_INTERVAL_MS = 1500;
+
+const waitForJob = async (job: BulkJob, onProgress: (job: BulkJob) => void): Promise<BulkJob> => {
+  let current = job;
+  while (current.status === "queued" || current.status === "running") {
+    onProgress(current);
+    await new Promise((resolve) => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+    current = await apiFetch<BulkJob>(`/admin/jobs/${current.id}`);
+  }
+  if (current.status === "failed") {
+    throw new Error(current.detail || "Erro ao processar arquivo.");
+  }
+  return current;
+};
+
 export default function PortalAdminUsuariosPage() {
   const [users, setUsers] = useState<User[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [form, setForm] = useState<CreateUserPayload>({
     name: "",
     email: "",
@@ -72,10 +95,26 @@ export default function PortalAdminUsuariosPage() {
 
   const loadUsers = async () => {
     try {
-      const data = await apiFetch<User[]>("/admin/users");
-      setUsers(data);
+      const page = await apiFetchPage<User>("/admin/users");
+      setUsers(page.items);
+      setNextCursor(page.nextCursor);
     } catch (err) {
       setUsers([]);
+      setNextCursor(null);
+    }
+  };
+
+  const loadMoreUsers = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const page = await apiFetchPage<User>("/admin/users", nextCursor);
+      setUsers((current) => [...current, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      setNextCursor(null);
+    } finally {
+      setLoadingMore(false);
     }
   };
 
@@ -249,10 +288,11 @@ export default function PortalAdminUsuariosPage() {
     formData.append("file", bulkCreateFile);
 
     try {
-      const result = await apiFetch<BulkResult>("/admin/users/bulk-create", {
+      const job = await apiFetch<BulkJob>("/admin/users/bulk-create", {
         method: "POST",
         body: formData,
       });
+      const result = await waitForJob(job, setBulkCreateResult);
       setBulkCreateResult(result);
       setBulkCreateFile(null);
       await loadUsers();
@@ -278,10 +318,11 @@ export default function PortalAdminUsuariosPage() {
     formData.append("file", bulkDeleteFile);
 
     try {
-      const result = await apiFetch<BulkResult>("/admin/users/bulk-delete", {
+      const job = await apiFetch<BulkJob>("/admin/users/bulk-delete", {
         method: "POST",
         body: formData,
       });
+      const result = await waitForJob(job, setBulkDeleteResult);
       setBulkDeleteResult(result);
       setBulkDeleteFile(null);
       await loadUsers();
@@ -586,6 +627,16 @@ export default function PortalAdminUsuariosPage() {
               </tbody>
             </table>
           </div>
+          {nextCursor && (
+            <button
+              type="button"
+              onClick={loadMoreUsers}
+              disabled={loadingMore}
+              className="mt-4 rounded-full border border-[#1f6dd1]/30 px-4 py-2 text-xs font-semibold uppercase tracking-[0.2em] text-[#1f6dd1] transition hover:bg-[#f2f6ff] disabled:opacity-60"
+            >
+              {loadingMore ? "Carregando..." : "Carregar mais"}
+            </button>
+          )}
         </div>
       </div>
 
@@ -5,7 +5,7 @@ import { PortalShell } from "../../components/portal/PortalShell";
 import { PortalCard } from "../../components/portal/PortalCard";
 import { Modal } from "../../components/portal/Modal";
 import { apiFetch } from "../../lib/api";
-import type { Announcement, PortalLink } from "../../lib/types";
+import type { Announcement, PortalBootstrap, PortalLink } from "../../lib/types";
 
 const NAV_LINKS = [
   { label: "Home", href: "/portal-socio" },
@@ -103,20 +103,15 @@ export default function PortalSocioHomePage() {
   useEffect(() => {
     const load = async () => {
       try {
-        const data = await apiFetch<Announcement[]>("/portal/announcements");
-        setAnnouncements(data);
-      } catch (error) {
-        setAnnouncements([]);
-      }
-
-      try {
-        const data = await apiFetch<PortalLink[]>("/portal/links");
-        const mapped = data.reduce<Record<string, PortalLink>>((acc, item) => {
+        const data = await apiFetch<PortalBootstrap>("/portal/bootstrap");
+        setAnnouncements(data.announcements);
+        const mapped = data.links.reduce<Record<string, PortalLink>>((acc, item) => {
           acc[item.slug] = item;
           return acc;
         }, {});
         setLinks((prev) => ({ ...prev, ...mapped }));
       } catch (error) {
+        setAnnouncements([]);
         setLinks(fallbackLinks);
       }
     };
@@ -1,26 +1,31 @@
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 from fastapi import Depends, HTTPException, Request, status
 from jose import JWTError, jwt
-from passlib.context import CryptContext
+from sqlalchemy import select, true
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from .cache import user_cache
+from .coherence import content_versions
 from .config import get_settings
-from .database import get_db
+from .database import AsyncSessionLocal, get_async_read_db, get_db
 from .models import User
 
 settings = get_settings()
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
-
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
-
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+# Detached projection of the authenticated user, safe to share between requests via user_cache.
+@dataclass(frozen=True)
+class CurrentUser:
+    id: str
+    name: str
+    email: str
+    role: str
+    active: bool
+    created_at: datetime
 
 
 def create_access_token(subject: str, expires_delta: Optional[timedelta] = None) -> str:
@@ -29,7 +34,7 @@ def create_access_token(subject: str, expires_delta: Optional[timedelta] = None)
     return jwt.encode(to_encode, settings.jwt_secret, algorithm=settings.jwt_algorithm)
 
 
-def get_current_user(request: Request, db: Session = Depends(get_db)) -> User:
+def _token_subject(request: Request) -> str:
     token = request.cookies.get(settings.cookie_name)
     if not token:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Não autenticado.")
@@ -42,14 +47,55 @@ def get_current_user(request: Request, db: Session = Depends(get_db)) -> User:
 
     if not user_id:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token inválido.")
+    return user_id
+
 
-    user = db.query(User).filter(User.id == user_id, User.active.is_(True)).first()
+def _current_user_statement(user_id: str):
+    return select(User.id, User.name, User.email, User.role, User.active, User.created_at).where(
+        User.id == user_id,
+        User.active == true(),
+    )
+
+
+def get_current_user(request: Request, db: Session = Depends(get_db)) -> CurrentUser:
+    user_id = _token_subject(request)
+    # Every cached read sits behind authentication, so this is where another worker's writes are noticed.
+    content_versions.check()
+    cached = user_cache.get(user_id)
+    if cached:
+        return cached
+
+    generation = user_cache.generation()
+    user = db.execute(_current_user_statement(user_id)).first()
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Usuário não encontrado.")
-    return user
+    current_user = CurrentUser(*user)
+    user_cache.put(user_id, current_user, generation)
+    return current_user
+
+
+async def get_current_user_async(request: Request, db: AsyncSession = Depends(get_async_read_db)) -> CurrentUser:
+    user_id = _token_subject(request)
+    # get_async_read_db has already checked content_versions for other workers' writes.
+    cached = user_cache.get(user_id)
+    if cached:
+        return cached
+
+    generation = user_cache.generation()
+    user = (await db.execute(_current_user_statement(user_id))).first()
+    if not user:
+        # The session may be on a replica that has not seen a just-created (or bulk-imported) user;
+        # only the primary can say the user is really gone.
+        async with AsyncSessionLocal() as primary:
+            user = (await primary.execute(_current_user_statement(user_id))).first()
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Usuário não encontrado.")
+    current_user = CurrentUser(*user)
+    user_cache.put(user_id, current_user, generation)
+    return current_user
 
 
-def require_admin(current_user: User = Depends(get_current_user)) -> User:
+def require_admin(current_user: CurrentUser = Depends(get_current_user)) -> CurrentUser:
     if current_user.role != "admin":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Acesso não autorizado.")
     return current_user
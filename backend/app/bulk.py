@@ -0,0 +1,232 @@
+from typing import BinaryIO, Callable, Optional
+
+from fastapi import HTTPException, status
+from openpyxl import load_workbook
+from sqlalchemy.orm import Session
+
+from .config import get_settings
+from .crud import create_users, delete_users, get_existing_emails, get_user_ids_by_email
+from .schemas import BulkUserResult
+
+settings = get_settings()
+
+# Called with the last spreadsheet row fully accounted for and the totals so far.
+ProgressCallback = Callable[[int, BulkUserResult], None]
+
+CREATE_TEMPLATE_COLUMNS = ["nome", "email", "senha", "perfil"]
+
+CREATE_HEADERS = {
+    "name": ["nome", "name"],
+    "email": ["email", "e-mail", "e mail"],
+    "password": ["senha", "password"],
+    "role": ["perfil", "role", "tipo", "papel"],
+}
+
+DELETE_HEADERS = {
+    "email": ["email", "e-mail", "e mail"],
+}
+
+ROLE_ALIASES = {
+    "admin": "admin",
+    "administrador": "admin",
+    "adm": "admin",
+    "socio": "socio",
+    "sócio": "socio",
+    "associado": "socio",
+}
+
+
+def normalize_value(value: object) -> str:
+    if value is None:
+        return ""
+    return str(value).strip()
+
+
+def normalize_header(value: object) -> str:
+    return normalize_value(value).lower()
+
+
+def get_header_index(ws, required_headers: dict[str, list[str]]) -> dict[str, int]:
+    header_row = next(ws.iter_rows(min_row=1, max_row=1, values_only=True), None)
+    if not header_row:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Arquivo inválido. Cabeçalho não encontrado.")
+
+    index_map: dict[str, int] = {}
+    for idx, cell_value in enumerate(header_row):
+        header = normalize_header(cell_value)
+        for field, aliases in required_headers.items():
+            if header in aliases and field not in index_map:
+                index_map[field] = idx
+
+    missing = [field for field in required_headers.keys() if field not in index_map]
+    if missing:
+        missing_label = ", ".join(missing)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Arquivo inválido. Colunas obrigatórias ausentes: {missing_label}.",
+        )
+    return index_map
+
+
+def open_sheet(stream: BinaryIO):
+    # read_only parses the sheet XML lazily, so memory stays flat regardless of the row count.
+    stream.seek(0)
+    workbook = load_workbook(stream, read_only=True, data_only=True)
+    return workbook, workbook.active
+
+
+def check_headers(stream: BinaryIO, required_headers: dict[str, list[str]]) -> None:
+    workbook, sheet = open_sheet(stream)
+    try:
+        get_header_index(sheet, required_headers)
+    finally:
+        workbook.close()
+
+
+def _flush_create_chunk(
+    db: Session,
+    chunk: list[tuple[int, str, str, str, str]],
+    errors: list[dict[str, object]],
+) -> int:
+    existing = get_existing_emails(db, [email for _, _, email, _, _ in chunk])
+    pending = []
+    for row_number, name, email, password, role in chunk:
+        if email in existing:
+            errors.append({"row": row_number, "message": "E-mail já cadastrado."})
+            continue
+        pending.append((row_number, name, email, password, role))
+
+    if not pending:
+        return 0
+
+    try:
+        create_users(db, [(name, email, password, role) for _, name, email, password, role in pending])
+        return len(pending)
+    except Exception:
+        db.rollback()
+
+    # The batch failed as a whole; retry row by row so each failure is reported on its own line.
+    created = 0
+    for row_number, name, email, password, role in pending:
+        try:
+            create_users(db, [(name, email, password, role)])
+            created += 1
+        except Exception:
+            db.rollback()
+            errors.append({"row": row_number, "message": "Erro ao criar usuário."})
+    return created
+
+
+def bulk_create_users(
+    db: Session,
+    stream: BinaryIO,
+    resume_from: Optional[tuple[int, BulkUserResult]] = None,
+    on_progress: Optional[ProgressCallback] = None,
+) -> BulkUserResult:
+    start_row, initial = resume_from or (1, BulkUserResult(processed=0, created=0, skipped=0))
+    workbook, sheet = open_sheet(stream)
+    try:
+        header_index = get_header_index(sheet, CREATE_HEADERS)
+
+        processed = initial.processed
+        created = initial.created or 0
+        errors: list[dict[str, object]] = [error.model_dump() for error in initial.errors]
+        seen_emails: set[str] = set()
+        chunk: list[tuple[int, str, str, str, str]] = []
+        checkpoint = processed
+
+        for row_number, row in enumerate(sheet.iter_rows(min_row=start_row + 1, values_only=True), start=start_row + 1):
+            values = {field: row[index] if index < len(row) else None for field, index in header_index.items()}
+            if all(normalize_value(value) == "" for value in values.values()):
+                continue
+
+            processed += 1
+            name = normalize_value(values["name"])
+            email = normalize_value(values["email"]).lower()
+            password = normalize_value(values["password"])
+            role_raw = normalize_value(values["role"]).lower()
+            role = ROLE_ALIASES.get(role_raw)
+
+            if not name or not email or not password or not role:
+                errors.append({"row": row_number, "message": "Campos obrigatórios ausentes ou perfil inválido."})
+            elif email in seen_emails:
+                errors.append({"row": row_number, "message": "E-mail duplicado no arquivo."})
+            else:
+                seen_emails.add(email)
+                chunk.append((row_number, name, email, password, role))
+
+            if processed - checkpoint >= settings.bulk_chunk_size:
+                created += _flush_create_chunk(db, chunk, errors)
+                chunk = []
+                checkpoint = processed
+                if on_progress:
+                    on_progress(row_number, BulkUserResult(processed=processed, created=created, skipped=len(errors), errors=errors))
+
+        if chunk:
+            created += _flush_create_chunk(db, chunk, errors)
+    finally:
+        workbook.close()
+
+    errors.sort(key=lambda error: error["row"])
+    return BulkUserResult(processed=processed, created=created, skipped=len(errors), errors=errors)
+
+
+def bulk_delete_users(
+    db: Session,
+    stream: BinaryIO,
+    current_user_id: str,
+    on_progress: Optional[ProgressCallback] = None,
+) -> BulkUserResult:
+    workbook, sheet = open_sheet(stream)
+    try:
+        header_index = get_header_index(sheet, DELETE_HEADERS)
+        email_index = header_index["email"]
+        rows: list[tuple[int, str]] = []
+        for row_number, row in enumerate(sheet.iter_rows(min_row=2, values_only=True), start=2):
+            email = normalize_value(row[email_index] if email_index < len(row) else None).lower()
+            if email:
+                rows.append((row_number, email))
+    finally:
+        workbook.close()
+
+    unique_emails = list(dict.fromkeys(email for _, email in rows))
+    user_ids: dict[str, str] = {}
+    chunk_size = settings.bulk_chunk_size
+    for start in range(0, len(unique_emails), chunk_size):
+        user_ids.update(get_user_ids_by_email(db, unique_emails[start:start + chunk_size]))
+
+    errors: list[dict[str, object]] = []
+    to_delete: dict[str, int] = {}
+    for row_number, email in rows:
+        user_id = user_ids.get(email)
+        # A repeated e-mail is reported as missing, since the earlier row already removed the user.
+        if not user_id or user_id in to_delete:
+            errors.append({"row": row_number, "message": "Usuário não encontrado."})
+            continue
+        if user_id == current_user_id:
+            errors.append({"row": row_number, "message": "Não é possível excluir o usuário logado."})
+            continue
+        to_delete[user_id] = row_number
+
+    if on_progress and rows:
+        # Deletion runs as a single transaction, so the only intermediate state is "resolved".
+        on_progress(1, BulkUserResult(processed=len(rows), deleted=0, skipped=len(errors), errors=errors))
+
+    deleted = 0
+    if to_delete:
+        try:
+            delete_users(db, list(to_delete), chunk_size)
+            deleted = len(to_delete)
+        except Exception:
+            db.rollback()
+            # Fall back to one transaction per user so a single bad row does not block the rest.
+            for user_id, row_number in to_delete.items():
+                try:
+                    delete_users(db, [user_id])
+                    deleted += 1
+                except Exception:
+                    db.rollback()
+                    errors.append({"row": row_number, "message": "Erro ao excluir usuário."})
+
+    errors.sort(key=lambda error: error["row"])
+    return BulkUserResult(processed=len(rows), deleted=deleted, skipped=len(errors), errors=errors)
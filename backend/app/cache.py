@@ -0,0 +1,166 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Hashable, NamedTuple, Optional
+
+from .config import get_settings
+
+settings = get_settings()
+
+
+# A serialized response body and the instant it stops being current (None when only a write can
+# change it). The ETag is not derived from the bytes: main builds it from the content versions and
+# `until`, so a revalidation can be answered without loading or serializing anything.
+class CachedBody(NamedTuple):
+    content: bytes
+    until: Optional[datetime] = None
+
+
+def make_body(content: bytes, until: Optional[datetime] = None) -> CachedBody:
+    return CachedBody(content, until)
+
+
+# A loader result that is only correct until a known instant (the next time a scheduled
+# announcement goes live or an expired one drops out). ContentCache stores the value alone and
+# ends the entry at that instant instead of waiting for the TTL.
+class Expiring(NamedTuple):
+    value: Any
+    until: Optional[datetime]
+
+
+# Read-through cache whose entries are tied to a content version. Admin writes call bump(), which
+# makes every entry stale at once; loaders that return Expiring end their entry at the next
+# visibility boundary. The TTL only bounds how long an entry lives if a write ever bypasses bump().
+class ContentCache:
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[str, tuple[int, float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _lookup(self, key: str) -> tuple[bool, Any, int, float]:
+        now = time.monotonic()
+        with self._lock:
+            version = self.version
+            entry = self._entries.get(key)
+            if entry and entry[0] == version and entry[1] > now:
+                self.hits += 1
+                return True, entry[2], version, now
+            self.misses += 1
+            return False, None, version, now
+
+    def _store(self, key: str, version: int, loaded_at: float, value: Any) -> Any:
+        deadline = loaded_at + self.ttl_seconds
+        if isinstance(value, Expiring):
+            if value.until is not None:
+                remaining = (value.until - datetime.now()).total_seconds()
+                deadline = min(deadline, time.monotonic() + remaining)
+            value = value.value
+        with self._lock:
+            # Keep the version read before loading: a bump during the load must still invalidate it.
+            if version == self.version:
+                self._entries[key] = (version, deadline, value)
+        return value
+
+    async def get_or_load_async(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        if self.ttl_seconds <= 0:
+            return _unwrap(await loader())
+        hit, value, version, now = self._lookup(key)
+        if hit:
+            return value
+        return self._store(key, version, now, await loader())
+
+    def bump(self) -> None:
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "version": self.version,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": _hit_rate(self.hits, self.misses),
+            }
+
+
+# Bounded LRU with a per-entry TTL. Writers invalidate keys explicitly; the TTL caps staleness for
+# changes made outside this process.
+class LRUCache:
+    def __init__(self, max_size: int, ttl_seconds: int):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._invalidations = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        if self.max_size <= 0 or self.ttl_seconds <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def generation(self) -> int:
+        return self._invalidations
+
+    def put(self, key: Hashable, value: Any, generation: Optional[int] = None) -> None:
+        if self.max_size <= 0 or self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            # A value read before an invalidation may already be outdated; dropping it is always safe.
+            if generation is not None and generation != self._invalidations:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *keys: Hashable) -> None:
+        with self._lock:
+            self._invalidations += 1
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._invalidations += 1
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": _hit_rate(self.hits, self.misses),
+            }
+
+
+def _unwrap(value: Any) -> Any:
+    return value.value if isinstance(value, Expiring) else value
+
+
+def _hit_rate(hits: int, misses: int) -> float:
+    total = hits + misses
+    return round(hits / total, 4) if total else 0.0
+
+
+portal_cache = ContentCache(settings.portal_cache_ttl_seconds)
+user_cache = LRUCache(settings.user_cache_size, settings.user_cache_ttl_seconds)
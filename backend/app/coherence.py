@@ -0,0 +1,131 @@
+import logging
+import threading
+import time
+from typing import Iterable, Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from .cache import portal_cache, user_cache
+from .config import get_settings
+from .database import async_engine, engine, read_routing
+from .models import ContentVersion
+from .search import search_index
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+PORTAL = "portal"
+USERS = "users"
+
+
+def bump_content(db: Session, *names: str) -> dict[str, int]:
+    # Runs inside the caller's write transaction, so the bump commits (or rolls back) with the data.
+    # Reading the row back while it is locked gives this transaction's exact version.
+    db.execute(
+        update(ContentVersion)
+        .where(ContentVersion.name.in_(names))
+        .values(version=ContentVersion.version + 1, updated_at=func.now())
+    )
+    return dict(db.execute(select(ContentVersion.name, ContentVersion.version).where(ContentVersion.name.in_(names))).all())
+
+
+# Per-worker view of content_versions. check() runs at most once per content_version_check_seconds
+# (one single-row-per-family read on the primary); when a version moved because another process
+# wrote, the matching local caches are dropped. Writes made by this process are already
+# invalidated in place, so observe() just advances the versions they produced.
+class ContentVersionWatcher:
+    def __init__(self, interval_seconds: float):
+        self.interval_seconds = interval_seconds
+        self.checks = 0
+        self.invalidations = 0
+        self._seen: dict[str, int] = {}
+        self._next_check = 0.0
+        self._checking = False
+        self._lock = threading.Lock()
+
+    def _due(self) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            if self._checking or now < self._next_check:
+                return False
+            self._checking = True
+            self._next_check = now + self.interval_seconds
+            return True
+
+    def _done(self, rows: Optional[Iterable[tuple[str, int]]]) -> None:
+        with self._lock:
+            if rows is None:
+                self._checking = False
+                return
+            self.checks += 1
+            changed = {name: version for name, version in rows if self._seen.get(name) != version}
+        if changed:
+            self.invalidations += 1
+            # Invalidate before publishing the versions, since response validators are built from them.
+            _invalidate(list(changed))
+        with self._lock:
+            for name, version in changed.items():
+                # observe() may have moved past the row read here while the caches were dropped.
+                if version > self._seen.get(name, -1):
+                    self._seen[name] = version
+            self._checking = False
+
+    def observe(self, versions: dict[str, int]) -> None:
+        with self._lock:
+            for name, version in versions.items():
+                # Only a bump directly after the last one seen is known to be ours alone; a gap means
+                # another process wrote too, and the next check has to invalidate for it.
+                if self._seen.get(name) == version - 1:
+                    self._seen[name] = version
+
+    def check(self) -> None:
+        if not self._due():
+            return
+        rows = None
+        try:
+            with engine.connect() as connection:
+                rows = connection.execute(select(ContentVersion.name, ContentVersion.version)).all()
+        except SQLAlchemyError:
+            logger.warning("Could not read content_versions; caches may be stale", exc_info=True)
+        finally:
+            self._done(rows)
+
+    async def check_async(self) -> None:
+        if not self._due():
+            return
+        rows = None
+        try:
+            async with async_engine.connect() as connection:
+                rows = (await connection.execute(select(ContentVersion.name, ContentVersion.version))).all()
+        except SQLAlchemyError:
+            logger.warning("Could not read content_versions; caches may be stale", exc_info=True)
+        finally:
+            self._done(rows)
+
+    def current(self, *names: str) -> Optional[tuple[int, ...]]:
+        with self._lock:
+            if not all(name in self._seen for name in names):
+                return None
+            return tuple(self._seen[name] for name in names)
+
+    def stats(self) -> dict[str, object]:
+        with self._lock:
+            return {"versions": dict(self._seen), "checks": self.checks, "invalidations": self.invalidations}
+
+
+def _invalidate(names: list[str]) -> None:
+    # Writers bump PORTAL along with USERS when a change reaches portal content (author renames).
+    if PORTAL in names:
+        portal_cache.bump()
+        # Not reset: the next search re-reads only the rows changed since its last read.
+        search_index.mark_stale()
+    if USERS in names:
+        user_cache.clear()
+    # The other process's commit may not have reached the replica yet.
+    read_routing.stick_to_primary()
+
+
+content_versions = ContentVersionWatcher(settings.content_version_check_seconds)
@@ -0,0 +1,144 @@
+import zlib
+from typing import Optional
+
+import brotli
+
+from .config import get_settings
+
+settings = get_settings()
+
+# XLSX (a zip) and images are already compressed; spending CPU on them buys nothing.
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/problem+json",
+    "text/",
+    "application/javascript",
+    "image/svg+xml",
+)
+
+# Preference order when the client accepts both with the same weight.
+ENCODINGS = ("br", "gzip")
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[token] = quality
+    best, best_quality = None, 0.0
+    for encoding in ENCODINGS:
+        quality = weights.get(encoding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def is_compressible(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return any(media_type.startswith(prefix) for prefix in COMPRESSIBLE_TYPES)
+
+
+class _Encoder:
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=settings.compression_brotli_quality)
+            self._zlib = None
+        else:
+            self._brotli = None
+            self._zlib = zlib.compressobj(settings.compression_gzip_level, zlib.DEFLATED, 31)
+
+    def chunk(self, data: bytes) -> bytes:
+        # Flushed per chunk so streamed exports reach the client progressively.
+        if self._brotli is not None:
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        if self._brotli is not None:
+            return self._brotli.process(data) + self._brotli.finish()
+        return self._zlib.compress(data) + self._zlib.flush()
+
+
+class CompressionMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept = value.decode("latin-1")
+                break
+        encoding = negotiate_encoding(accept) if accept else None
+
+        start_message = None
+        encoder: Optional[_Encoder] = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, encoder, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if encoder is None:
+                headers = list(start_message.get("headers", []))
+                names = {name for name, _ in headers}
+                content_type = next((value.decode("latin-1") for name, value in headers if name == b"content-type"), "")
+                eligible = (
+                    encoding is not None
+                    and b"content-encoding" not in names
+                    and is_compressible(content_type)
+                    # A single small body is not worth the overhead; streams are assumed large.
+                    and (more_body or len(body) >= settings.compression_min_size)
+                )
+                if is_compressible(content_type):
+                    # Identity responses vary on the header too, or a shared cache could replay them.
+                    headers.append((b"vary", b"Accept-Encoding"))
+                if not eligible:
+                    passthrough = True
+                    start_message["headers"] = headers
+                    await send(start_message)
+                    await send(message)
+                    return
+
+                encoder = _Encoder(encoding)
+                headers = [(name, value) for name, value in headers if name != b"content-length"]
+                headers.append((b"content-encoding", encoding.encode("ascii")))
+                if not more_body:
+                    compressed = encoder.finish(body)
+                    headers.append((b"content-length", str(len(compressed)).encode("ascii")))
+                    start_message["headers"] = headers
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": compressed})
+                    return
+                start_message["headers"] = headers
+                await send(start_message)
+
+            data = encoder.chunk(body) if more_body else encoder.finish(body)
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
+        if start_message is not None and encoder is None and not passthrough:
+            # The app sent a start message but no body (HEAD handling, for instance).
+            await send(start_message)
@@ -1,9 +1,14 @@
 from functools import lru_cache
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
     database_url: str = "mysql+pymysql://souarte:souarte@db:3306/souarte"
+    async_database_url: Optional[str] = None
+    read_database_url: Optional[str] = None
+    read_sticky_seconds: float = 5
+    read_replica_retry_seconds: float = 30
     jwt_secret: str = "change-me"
     jwt_algorithm: str = "HS256"
     access_token_expire_minutes: int = 480
@@ -13,6 +18,31 @@ class Settings(BaseSettings):
     admin_email: str = "admin@souarte.com"
     admin_password: str = "admin123"
     admin_name: str = "Administrador"
+    bulk_chunk_size: int = 500
+    password_hash_workers: int = 0
+    password_hash_rounds: Optional[int] = None
+    login_verify_workers: int = 0
+    login_queue_size: int = 32
+    login_retry_after_seconds: int = 5
+    login_flush_seconds: float = 10
+    login_history_enabled: bool = True
+    login_history_days: int = 90
+    login_history_buffer_size: int = 10000
+    import_job_workers: int = 2
+    # A running job's heartbeat is refreshed on this timer, independent of chunk progress; the stale
+    # threshold only has to outlast a few missed beats.
+    import_job_heartbeat_seconds: int = 30
+    import_job_stale_seconds: int = 300
+    portal_cache_ttl_seconds: int = 300
+    user_cache_size: int = 2048
+    user_cache_ttl_seconds: int = 60
+    content_version_check_seconds: float = 1.0
+    migrate_on_startup: bool = True
+    compression_min_size: int = 1024
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4
+    query_log_enabled: bool = False
+    slow_query_threshold_ms: int = 200
 
 
 @lru_cache
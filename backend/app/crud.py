@@ -1,17 +1,145 @@
-from datetime import date, datetime
-from typing import Optional
-from sqlalchemy.orm import Session
+from datetime import date, datetime, timedelta
+from itertools import chain
+from typing import Iterable, Iterator, Optional
+from pydantic import TypeAdapter
+from sqlalchemy import case, func, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
 
 from . import models
-from .auth import hash_password
+from .auth import CurrentUser
+from .cache import CachedBody, Expiring, make_body, portal_cache, user_cache
+from .coherence import PORTAL, USERS, bump_content, content_versions
+from .database import read_routing
+from .pagination import apply_keyset
+from .schemas import (
+    AnnouncementPublic,
+    AnnouncementRow,
+    CoursePublic,
+    CourseRow,
+    LoginDayPublic,
+    PartnerPublic,
+    PartnerRow,
+    PortalLinkPublic,
+    UserPublic,
+    UserRow,
+)
+from .hashing import hash_password, hash_passwords
+from .search import (
+    SearchDocument,
+    announcement_document,
+    course_document,
+    index_item,
+    partner_document,
+    search_index,
+)
 
 
 def get_user_by_email(db: Session, email: str) -> Optional[models.User]:
     return db.query(models.User).filter(models.User.email == email).first()
 
 
-def list_users(db: Session) -> list[models.User]:
-    return db.query(models.User).order_by(models.User.created_at.desc()).all()
+_announcements_adapter = TypeAdapter(list[AnnouncementPublic])
+_courses_adapter = TypeAdapter(list[CoursePublic])
+_links_adapter = TypeAdapter(list[PortalLinkPublic])
+_link_adapter = TypeAdapter(PortalLinkPublic)
+_partners_adapter = TypeAdapter(list[PartnerPublic])
+_user_adapter = TypeAdapter(UserPublic)
+
+_user_rows_adapter = TypeAdapter(list[UserRow])
+_announcement_rows_adapter = TypeAdapter(list[AnnouncementRow])
+_course_rows_adapter = TypeAdapter(list[CourseRow])
+_partner_rows_adapter = TypeAdapter(list[PartnerRow])
+
+
+def _serialize(adapter: TypeAdapter, value: object) -> CachedBody:
+    return make_body(adapter.dump_json(adapter.validate_python(value, from_attributes=True)))
+
+
+def _row_columns(model: type, row_type: type) -> list:
+    return [getattr(model, field) for field in row_type.__annotations__]
+
+
+def _rows_json(adapter: TypeAdapter, rows: list[dict]) -> bytes:
+    return adapter.dump_json(adapter.validate_python(rows))
+
+
+def users_json(rows: list[UserRow]) -> bytes:
+    return _rows_json(_user_rows_adapter, rows)
+
+
+def announcements_json(rows: list[AnnouncementRow]) -> bytes:
+    return _rows_json(_announcement_rows_adapter, rows)
+
+
+def courses_json(rows: list[CourseRow]) -> bytes:
+    return _rows_json(_course_rows_adapter, rows)
+
+
+def partners_json(rows: list[PartnerRow]) -> bytes:
+    return _rows_json(_partner_rows_adapter, rows)
+
+
+def _commit_content(db: Session, *names: str, user_ids: Iterable[str] = ()) -> None:
+    # The version bump commits with the data, so other workers see both or neither.
+    versions = bump_content(db, *names)
+    db.commit()
+    # Local caches are dropped before the new versions are published: a response tagged with a new
+    # version must never be built from an entry loaded before the write.
+    if user_ids:
+        user_cache.invalidate(*user_ids)
+    if PORTAL in names:
+        portal_cache.bump()
+    # The replica may not have this commit yet; keep reads (and the cache refill) on the primary.
+    read_routing.stick_to_primary()
+    content_versions.observe(versions)
+
+
+def invalidate_portal_cache(db: Session) -> None:
+    # For rows written without crud (fixtures, manual fixes): bumping the versions moves every worker's
+    # caches and ETags on, and the search index re-reads what changed on the next search.
+    _commit_content(db, PORTAL, USERS)
+    user_cache.clear()
+    search_index.mark_stale()
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def list_users(
+    db: Session,
+    role: Optional[str] = None,
+    active: Optional[bool] = None,
+    search: Optional[str] = None,
+    limit: Optional[int] = None,
+    after: Optional[tuple] = None,
+) -> list[UserRow]:
+    query = db.query(*_row_columns(models.User, UserRow))
+    if role is not None:
+        query = query.filter(models.User.role == role)
+    if active is not None:
+        query = query.filter(models.User.active == active)
+    if search:
+        prefix = f"{_escape_like(search)}%"
+        query = query.filter(
+            models.User.name.like(prefix, escape="\\") | models.User.email.like(prefix.lower(), escape="\\")
+        )
+    query = apply_keyset(query, [models.User.created_at, models.User.id], True, after)
+    if limit is not None:
+        query = query.limit(limit)
+    return [row._asdict() for row in query]
+
+
+def iter_user_rows(db: Session, batch_size: int = 1000) -> Iterator[tuple[str, str, str]]:
+    query = (
+        db.query(models.User.name, models.User.email, models.User.role)
+        .order_by(models.User.created_at.desc())
+        .execution_options(stream_results=True)
+        .yield_per(batch_size)
+    )
+    for name, email, role in query:
+        yield name, email, role
 
 
 def create_user(db: Session, name: str, email: str, password: str, role: str) -> models.User:
@@ -22,12 +150,61 @@ def create_user(db: Session, name: str, email: str, password: str, role: str) ->
         role=role,
         active=True,
     )
+    # A new user is in no cache yet, so there is nothing for other workers to drop; reads still stay
+    # on the primary until the replica has the row.
     db.add(user)
     db.commit()
+    read_routing.stick_to_primary()
     db.refresh(user)
     return user
 
 
+def create_users(db: Session, rows: list[tuple[str, str, str, str]]) -> list[models.User]:
+    password_hashes = hash_passwords([password for _, _, password, _ in rows])
+    users = [
+        models.User(
+            name=name,
+            email=email,
+            password_hash=password_hash,
+            role=role,
+            active=True,
+        )
+        for (name, email, _, role), password_hash in zip(rows, password_hashes)
+    ]
+    db.add_all(users)
+    db.commit()
+    read_routing.stick_to_primary()
+    return users
+
+
+def get_user_ids_by_email(db: Session, emails: Iterable[str]) -> dict[str, str]:
+    emails = list(emails)
+    if not emails:
+        return {}
+    rows = db.query(models.User.email, models.User.id).filter(models.User.email.in_(emails)).all()
+    return {email.lower(): user_id for email, user_id in rows}
+
+
+def get_existing_emails(db: Session, emails: Iterable[str]) -> set[str]:
+    return set(get_user_ids_by_email(db, emails))
+
+
+def delete_users(db: Session, user_ids: list[str], chunk_size: int = 500) -> None:
+    for start in range(0, len(user_ids), chunk_size):
+        chunk = user_ids[start:start + chunk_size]
+        db.query(models.Announcement).filter(models.Announcement.created_by.in_(chunk)).update(
+            {models.Announcement.created_by: None},
+            synchronize_session=False,
+        )
+        db.query(models.Course).filter(models.Course.created_by.in_(chunk)).update(
+            {models.Course.created_by: None},
+            synchronize_session=False,
+        )
+        db.query(models.User).filter(models.User.id.in_(chunk)).delete(synchronize_session=False)
+    # Their announcements and courses lose the author name, so the portal content changes too.
+    _commit_content(db, USERS, PORTAL, user_ids=user_ids)
+
+
 def update_user(
     db: Session,
     user: models.User,
@@ -36,6 +213,8 @@ def update_user(
     role: Optional[str],
     active: Optional[bool],
 ) -> models.User:
+    # Announcements show their author's name; any other field only reaches cached logins.
+    renamed = name is not None and name != user.name
     if name is not None:
         user.name = name
     if email is not None:
@@ -44,21 +223,77 @@ def update_user(
         user.active = active
     if role is not None:
         user.role = role
+    _commit_content(db, *((USERS, PORTAL) if renamed else (USERS,)), user_ids=[user.id])
+    db.refresh(user)
+    return user
+
+
+def update_user_password(db: Session, user: models.User, password: str) -> models.User:
+    user.password_hash = hash_password(password)
     db.commit()
+    user_cache.invalidate(user.id)
     db.refresh(user)
     return user
 
 
-def list_announcements(db: Session, only_active: bool, only_visible: bool = False) -> list[models.Announcement]:
-    query = db.query(models.Announcement)
-    if only_active:
-        query = query.filter(models.Announcement.is_active.is_(True))
-    if only_visible:
-        now = datetime.now()
-        query = query.filter(
-            (models.Announcement.expires_at.is_(None)) | (models.Announcement.expires_at >= now)
-        )
-    return query.order_by(models.Announcement.published_at.desc()).all()
+def login_activity(db: Session, days: int) -> list[LoginDayPublic]:
+    day = func.date(models.LoginEvent.logged_in_at)
+    since = datetime.combine(date.today() - timedelta(days=days - 1), datetime.min.time())
+    rows = db.execute(
+        select(day.label("day"), func.count().label("logins"), func.count(models.LoginEvent.user_id.distinct()).label("users"))
+        .where(models.LoginEvent.logged_in_at >= since)
+        .group_by(day)
+        .order_by(day)
+    ).all()
+    return [LoginDayPublic.model_validate(row._mapping) for row in rows]
+
+
+def _not_expired():
+    return (models.Announcement.expires_at.is_(None)) | (models.Announcement.expires_at >= datetime.now())
+
+
+def _visible_at(now: datetime):
+    announcement = models.Announcement
+    return (announcement.published_at <= now) & (announcement.expires_at.is_(None) | (announcement.expires_at >= now))
+
+
+def _next_visibility_change(now: datetime):
+    # The earliest instant after `now` at which an active announcement goes live or drops out, so
+    # the visible set read at `now` can be served unchanged until then.
+    announcement = models.Announcement
+    return select(
+        func.min(case((announcement.published_at > now, announcement.published_at))),
+        func.min(case((announcement.expires_at >= now, announcement.expires_at))),
+    ).where(announcement.is_active == true())
+
+
+def _earliest(*moments: Optional[datetime]) -> Optional[datetime]:
+    return min((moment for moment in moments if moment is not None), default=None)
+
+
+def list_announcements(
+    db: Session,
+    active: Optional[bool] = None,
+    visible: Optional[bool] = None,
+    limit: Optional[int] = None,
+    after: Optional[tuple] = None,
+    now: Optional[datetime] = None,
+) -> list[AnnouncementRow]:
+    columns = [
+        models.User.name.label("author_name") if field == "author_name" else getattr(models.Announcement, field)
+        for field in AnnouncementRow.__annotations__
+    ]
+    # author_name comes from the join, so listing N rows stays one statement.
+    query = db.query(*columns).select_from(models.Announcement).outerjoin(models.Announcement.author)
+    if active is not None:
+        query = query.filter(models.Announcement.is_active == active)
+    if visible is not None:
+        visible_now = _visible_at(now or datetime.now())
+        query = query.filter(visible_now if visible else ~visible_now)
+    query = apply_keyset(query, [models.Announcement.published_at, models.Announcement.id], True, after)
+    if limit is not None:
+        query = query.limit(limit)
+    return [row._asdict() for row in query]
 
 
 def create_announcement(
@@ -80,8 +315,9 @@ def create_announcement(
         is_active=True,
     )
     db.add(item)
-    db.commit()
+    _commit_content(db, PORTAL)
     db.refresh(item)
+    index_item("announcement", item)
     return item
 
 
@@ -97,21 +333,32 @@ def update_announcement(
     announcement.body = body
     announcement.published_at = datetime.combine(published_at, datetime.min.time())
     announcement.expires_at = datetime.combine(expires_at, datetime.max.time())
-    db.commit()
+    _commit_content(db, PORTAL)
     db.refresh(announcement)
+    index_item("announcement", announcement)
     return announcement
 
 
 def delete_announcement(db: Session, announcement: models.Announcement) -> None:
+    item_id = announcement.id
     db.delete(announcement)
-    db.commit()
+    _commit_content(db, PORTAL)
+    search_index.remove("announcement", item_id)
 
 
-def list_courses(db: Session, only_active: bool) -> list[models.Course]:
-    query = db.query(models.Course)
+def list_courses(
+    db: Session,
+    only_active: bool,
+    limit: Optional[int] = None,
+    after: Optional[tuple] = None,
+) -> list[CourseRow]:
+    query = db.query(*_row_columns(models.Course, CourseRow))
     if only_active:
-        query = query.filter(models.Course.is_active.is_(True))
-    return query.order_by(models.Course.created_at.desc()).all()
+        query = query.filter(models.Course.is_active == true())
+    query = apply_keyset(query, [models.Course.created_at, models.Course.id], True, after)
+    if limit is not None:
+        query = query.limit(limit)
+    return [row._asdict() for row in query]
 
 
 def create_course(
@@ -131,8 +378,9 @@ def create_course(
         is_active=True,
     )
     db.add(item)
-    db.commit()
+    _commit_content(db, PORTAL)
     db.refresh(item)
+    index_item("course", item)
     return item
 
 
@@ -148,29 +396,32 @@ def update_course(
     course.description = description
     course.image_url = image_url
     course.access_url = access_url
-    db.commit()
+    _commit_content(db, PORTAL)
     db.refresh(course)
+    index_item("course", course)
     return course
 
 
 def delete_course(db: Session, course: models.Course) -> None:
+    item_id = course.id
     db.delete(course)
-    db.commit()
-
-
-def list_portal_links(db: Session) -> list[models.PortalLink]:
-    return db.query(models.PortalLink).filter(models.PortalLink.is_active.is_(True)).all()
-
+    _commit_content(db, PORTAL)
+    search_index.remove("course", item_id)
 
-def get_portal_link(db: Session, slug: str) -> Optional[models.PortalLink]:
-    return db.query(models.PortalLink).filter(models.PortalLink.slug == slug, models.PortalLink.is_active.is_(True)).first()
 
-
-def list_partners(db: Session, only_active: bool = True) -> list[models.Partner]:
-    query = db.query(models.Partner)
+def list_partners(
+    db: Session,
+    only_active: bool = True,
+    limit: Optional[int] = None,
+    after: Optional[tuple] = None,
+) -> list[PartnerRow]:
+    query = db.query(*_row_columns(models.Partner, PartnerRow))
     if only_active:
-        query = query.filter(models.Partner.is_active.is_(True))
-    return query.order_by(models.Partner.name.asc()).all()
+        query = query.filter(models.Partner.is_active == true())
+    query = apply_keyset(query, [models.Partner.name, models.Partner.id], False, after)
+    if limit is not None:
+        query = query.limit(limit)
+    return [row._asdict() for row in query]
 
 
 def create_partner(
@@ -188,8 +439,9 @@ def create_partner(
         is_active=True,
     )
     db.add(item)
-    db.commit()
+    _commit_content(db, PORTAL)
     db.refresh(item)
+    index_item("partner", item)
     return item
 
 
@@ -205,11 +457,175 @@ def update_partner(
     partner.description = description
     partner.link_url = link_url
     partner.logo_url = logo_url
-    db.commit()
+    _commit_content(db, PORTAL)
     db.refresh(partner)
+    index_item("partner", partner)
     return partner
 
 
 def delete_partner(db: Session, partner: models.Partner) -> None:
+    item_id = partner.id
     db.delete(partner)
-    db.commit()
+    _commit_content(db, PORTAL)
+    search_index.remove("partner", item_id)
+
+
+# Async counterparts of the member-facing reads. They share the portal cache and serializers with
+# the sync functions above; relationships are loaded eagerly because lazy loads cannot run here.
+
+
+async def get_user_by_email_async(db: AsyncSession, email: str) -> Optional[models.User]:
+    return (await db.scalars(select(models.User).where(models.User.email == email))).first()
+
+
+async def list_visible_announcements_async(db: AsyncSession, now: datetime) -> list[models.Announcement]:
+    statement = (
+        select(models.Announcement)
+        .options(joinedload(models.Announcement.author))
+        .where(models.Announcement.is_active == true(), _visible_at(now))
+        .order_by(models.Announcement.published_at.desc(), models.Announcement.id.desc())
+    )
+    return list((await db.scalars(statement)).all())
+
+
+async def _visible_announcements_json_async(db: AsyncSession) -> Expiring:
+    now = datetime.now()
+    rows = await list_visible_announcements_async(db, now)
+    until = _earliest(*(await db.execute(_next_visibility_change(now))).one())
+    return Expiring(make_body(_serialize(_announcements_adapter, rows).content, until), until)
+
+
+async def list_active_courses_async(db: AsyncSession) -> list[models.Course]:
+    statement = (
+        select(models.Course)
+        .where(models.Course.is_active == true())
+        .order_by(models.Course.created_at.desc(), models.Course.id.desc())
+    )
+    return list((await db.scalars(statement)).all())
+
+
+async def list_portal_links_async(db: AsyncSession) -> list[models.PortalLink]:
+    statement = select(models.PortalLink).where(models.PortalLink.is_active == true())
+    return list((await db.scalars(statement)).all())
+
+
+async def list_active_partners_async(db: AsyncSession) -> list[models.Partner]:
+    statement = (
+        select(models.Partner)
+        .where(models.Partner.is_active == true())
+        .order_by(models.Partner.name.asc(), models.Partner.id.asc())
+    )
+    return list((await db.scalars(statement)).all())
+
+
+async def portal_announcements_json_async(db: AsyncSession) -> CachedBody:
+    return await portal_cache.get_or_load_async("announcements", lambda: _visible_announcements_json_async(db))
+
+
+async def portal_courses_json_async(db: AsyncSession) -> CachedBody:
+    async def load() -> CachedBody:
+        return _serialize(_courses_adapter, await list_active_courses_async(db))
+
+    return await portal_cache.get_or_load_async("courses", load)
+
+
+async def portal_links_json_async(db: AsyncSession) -> CachedBody:
+    async def load() -> CachedBody:
+        return _serialize(_links_adapter, await list_portal_links_async(db))
+
+    return await portal_cache.get_or_load_async("links", load)
+
+
+async def portal_link_json_async(db: AsyncSession, slug: str) -> Optional[CachedBody]:
+    async def load() -> dict[str, CachedBody]:
+        return {link.slug: _serialize(_link_adapter, link) for link in await list_portal_links_async(db)}
+
+    links = await portal_cache.get_or_load_async("links_by_slug", load)
+    return links.get(slug)
+
+
+async def portal_partners_json_async(db: AsyncSession) -> CachedBody:
+    async def load() -> CachedBody:
+        return _serialize(_partners_adapter, await list_active_partners_async(db))
+
+    return await portal_cache.get_or_load_async("partners", load)
+
+
+def _join_fields(parts: list[tuple[bytes, CachedBody]]) -> bytes:
+    return b",".join(b'"' + name + b'":' + body.content for name, body in parts)
+
+
+def _bootstrap_body(user: CurrentUser, collections: CachedBody) -> CachedBody:
+    content = b'{"user":' + _serialize(_user_adapter, user).content + b"," + collections.content + b"}"
+    return make_body(content, collections.until)
+
+
+async def portal_bootstrap_json_async(db: AsyncSession, user: CurrentUser) -> CachedBody:
+    async def load() -> Expiring:
+        announcements = await _visible_announcements_json_async(db)
+        parts = [
+            (b"announcements", announcements.value),
+            (b"courses", _serialize(_courses_adapter, await list_active_courses_async(db))),
+            (b"links", _serialize(_links_adapter, await list_portal_links_async(db))),
+            (b"partners", _serialize(_partners_adapter, await list_active_partners_async(db))),
+        ]
+        return Expiring(make_body(_join_fields(parts), announcements.until), announcements.until)
+
+    collections = await portal_cache.get_or_load_async("bootstrap", load)
+    return _bootstrap_body(user, collections)
+
+
+def _indexable(model: type, since: Optional[datetime] = None) -> list:
+    conditions = [model.is_active == true()]
+    if model is models.Announcement:
+        conditions.append(_not_expired())
+    if since is not None:
+        conditions.append(model.updated_at >= since)
+    return conditions
+
+
+async def database_now_async(db: AsyncSession) -> datetime:
+    # updated_at is stamped by the database, so the search index tracks its reads on the same clock.
+    return await db.scalar(select(func.now()))
+
+
+async def search_documents_async(db: AsyncSession, since: Optional[datetime] = None) -> Iterator[SearchDocument]:
+    # Only the indexed columns are read; the documents themselves are built lazily by the caller,
+    # off the event loop, since tokenizing tens of thousands of rows takes a while. With since, only
+    # rows updated from then on are read.
+    announcements = (
+        await db.execute(
+            select(
+                models.Announcement.id,
+                models.Announcement.title,
+                models.Announcement.body,
+                models.Announcement.published_at,
+                models.Announcement.expires_at,
+            ).where(*_indexable(models.Announcement, since))
+        )
+    ).all()
+    courses = (
+        await db.execute(
+            select(models.Course.id, models.Course.title, models.Course.description, models.Course.created_at)
+            .where(*_indexable(models.Course, since))
+        )
+    ).all()
+    partners = (
+        await db.execute(
+            select(models.Partner.id, models.Partner.name, models.Partner.description, models.Partner.created_at)
+            .where(*_indexable(models.Partner, since))
+        )
+    ).all()
+    return chain(
+        map(announcement_document, announcements),
+        map(course_document, courses),
+        map(partner_document, partners),
+    )
+
+
+async def search_live_ids_async(db: AsyncSession) -> dict[str, set[str]]:
+    # Ids only, served from the (is_active, ..., id) indexes; tells a sync which documents to drop.
+    live = {}
+    for kind, model in (("announcement", models.Announcement), ("course", models.Course), ("partner", models.Partner)):
+        live[kind] = set((await db.scalars(select(model.id).where(*_indexable(model)))).all())
+    return live
@@ -1,14 +1,91 @@
+import logging
+import time
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 from .config import get_settings
+from .metrics import DB_READ_ROUTES, TimedAsyncQueuePool, TimedQueuePool, TimedReplicaQueuePool
 
 settings = get_settings()
 
-engine = create_engine(settings.database_url, pool_pre_ping=True)
+logger = logging.getLogger(__name__)
+
+ASYNC_DRIVERS = {
+    "mysql+pymysql": "mysql+aiomysql",
+    "mysql": "mysql+aiomysql",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_database_url(url: str) -> str:
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def pool_options(url: str, poolclass: type) -> dict[str, type]:
+    parsed = make_url(url)
+    # In-memory SQLite relies on its dialect's single-connection pool; leave it alone.
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return {}
+    return {"poolclass": poolclass}
+
+
+engine = create_engine(settings.database_url, pool_pre_ping=True, **pool_options(settings.database_url, TimedQueuePool))
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 Base = declarative_base()
 
+_async_url = settings.async_database_url or async_database_url(settings.database_url)
+async_engine = create_async_engine(_async_url, pool_pre_ping=True, **pool_options(_async_url, TimedAsyncQueuePool))
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False, class_=AsyncSession)
+
+# Optional read replica for the member-facing reads (portal and /auth/me). Only the async engine is
+# needed, since those paths are all async.
+read_async_engine = None
+AsyncReadSessionLocal = None
+if settings.read_database_url:
+    _read_async_url = async_database_url(settings.read_database_url)
+    read_async_engine = create_async_engine(
+        _read_async_url, pool_pre_ping=True, **pool_options(_read_async_url, TimedReplicaQueuePool)
+    )
+    AsyncReadSessionLocal = async_sessionmaker(
+        bind=read_async_engine, autoflush=False, expire_on_commit=False, class_=AsyncSession
+    )
+
+
+# Decides whether a read session may use the replica. After an admin write every read goes to the
+# primary for read_sticky_seconds, so neither the writer nor the portal cache refill right after the
+# bump can see the replica's older state; after a failed connect the replica is skipped for a while.
+class ReadRouting:
+    def __init__(self, sticky_seconds: float, retry_seconds: float):
+        self.sticky_seconds = sticky_seconds
+        self.retry_seconds = retry_seconds
+        self._primary_until = 0.0
+        self._replica_down_until = 0.0
+
+    def stick_to_primary(self) -> None:
+        self._primary_until = max(self._primary_until, time.monotonic() + self.sticky_seconds)
+
+    def replica_failed(self) -> None:
+        self._replica_down_until = time.monotonic() + self.retry_seconds
+
+    def target(self) -> str:
+        if AsyncReadSessionLocal is None:
+            return "primary"
+        now = time.monotonic()
+        if now < self._primary_until:
+            return "primary_sticky"
+        if now < self._replica_down_until:
+            return "primary_fallback"
+        return "replica"
+
+
+read_routing = ReadRouting(settings.read_sticky_seconds, settings.read_replica_retry_seconds)
+
 
 def get_db():
     db = SessionLocal()
@@ -16,3 +93,34 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db():
+    # Imported here because coherence is built on this module's engines.
+    from .coherence import content_versions
+
+    # Before routing: a write noticed here sticks reads to the primary, so the caches it drops are
+    # not refilled from a replica that may still be behind.
+    await content_versions.check_async()
+    target = read_routing.target()
+    if target == "replica":
+        async with AsyncReadSessionLocal() as db:
+            try:
+                # Check out the connection now, so an unreachable replica falls back before any query.
+                await db.connection()
+            except Exception:
+                logger.warning("Read replica unavailable; reading from the primary", exc_info=True)
+                read_routing.replica_failed()
+            else:
+                DB_READ_ROUTES.labels("replica").inc()
+                yield db
+                return
+        target = "primary_fallback"
+    DB_READ_ROUTES.labels(target).inc()
+    async with AsyncSessionLocal() as db:
+        yield db
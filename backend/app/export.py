@@ -0,0 +1,67 @@
+import csv
+import tempfile
+from io import StringIO
+from typing import Iterator
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+
+from .bulk import CREATE_TEMPLATE_COLUMNS
+from .crud import iter_user_rows
+from .database import SessionLocal
+
+EXPORT_BATCH_SIZE = 1000
+FILE_CHUNK_SIZE = 64 * 1024
+
+# Spreadsheet apps run a cell starting with one of these as a formula (CSV injection).
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _csv_cell(value: str) -> str:
+    return "'" + value if value.startswith(FORMULA_PREFIXES) else value
+
+
+def _export_rows() -> Iterator[list[str]]:
+    # The request session is closed before a streamed body is sent, so the export owns its own.
+    with SessionLocal() as db:
+        for name, email, role in iter_user_rows(db, EXPORT_BATCH_SIZE):
+            # Password hashes are never exported; the column is kept so the file can be re-imported.
+            yield [name, email, "", role]
+
+
+def iter_users_csv() -> Iterator[bytes]:
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+    buffer.write("\ufeff")
+    writer.writerow(CREATE_TEMPLATE_COLUMNS)
+    for count, row in enumerate(_export_rows(), start=1):
+        writer.writerow([_csv_cell(value) for value in row])
+        if count % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode("utf-8")
+
+
+def _xlsx_cell(sheet, value: str):
+    if not value.startswith("="):
+        return value
+    # openpyxl stores a string starting with "=" as a formula; force it back to plain text.
+    cell = WriteOnlyCell(sheet, value)
+    cell.data_type = "s"
+    return cell
+
+
+def iter_users_xlsx() -> Iterator[bytes]:
+    # write_only spools rows to disk as they are appended; the zip container can only be produced
+    # once every row is written, so it is saved to a temporary file and sent in fixed-size chunks.
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("usuarios")
+    sheet.append(CREATE_TEMPLATE_COLUMNS)
+    for row in _export_rows():
+        sheet.append([_xlsx_cell(sheet, value) for value in row])
+    with tempfile.TemporaryFile() as output:
+        workbook.save(output)
+        output.seek(0)
+        while chunk := output.read(FILE_CHUNK_SIZE):
+            yield chunk
@@ -0,0 +1,116 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from .config import get_settings
+from .metrics import LOGIN_IN_FLIGHT, LOGIN_QUEUE_DEPTH, LOGIN_QUEUE_WAIT_SECONDS, LOGIN_REJECTED, PASSWORD_SECONDS
+
+settings = get_settings()
+
+# Rounds only apply to new hashes; existing hashes carry their own cost and still verify.
+_rounds = {"bcrypt__rounds": settings.password_hash_rounds} if settings.password_hash_rounds else {}
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", **_rounds)
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+_login_executor: Optional[ThreadPoolExecutor] = None
+_login_workers = settings.login_verify_workers or os.cpu_count() or 1
+# Admission covers running and queued verifications; beyond that a login is refused, not queued.
+_login_slots = threading.BoundedSemaphore(_login_workers + settings.login_queue_size)
+
+
+def hash_password(password: str) -> str:
+    with PASSWORD_SECONDS.labels("hash").time():
+        return pwd_context.hash(password)
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    with PASSWORD_SECONDS.labels("verify").time():
+        return pwd_context.verify(plain_password, hashed_password)
+
+
+def hash_workers() -> int:
+    return settings.password_hash_workers or os.cpu_count() or 1
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # spawn keeps forked children from inheriting the server's threads and open DB connections.
+            _executor = ProcessPoolExecutor(
+                max_workers=hash_workers(),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+def hash_passwords(passwords: list[str]) -> list[str]:
+    workers = hash_workers()
+    if workers <= 1 or len(passwords) <= 1:
+        return [hash_password(password) for password in passwords]
+    chunksize = max(1, len(passwords) // (workers * 4))
+    # Pool workers record into their own registries; time the whole batch here instead.
+    with PASSWORD_SECONDS.labels("hash_batch").time():
+        return list(_get_executor().map(hash_password, passwords, chunksize=chunksize))
+
+
+def _get_login_executor() -> ThreadPoolExecutor:
+    global _login_executor
+    with _executor_lock:
+        if _login_executor is None:
+            # Separate from Starlette's threadpool, so a login burst cannot starve ordinary requests.
+            _login_executor = ThreadPoolExecutor(max_workers=_login_workers, thread_name_prefix="login-verify")
+        return _login_executor
+
+
+def _release_login_slot(_) -> None:
+    LOGIN_IN_FLIGHT.dec()
+    _login_slots.release()
+
+
+async def verify_login_password(plain_password: str, hashed_password: str) -> bool:
+    if not _login_slots.acquire(blocking=False):
+        LOGIN_REJECTED.inc()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Muitos acessos simultâneos. Tente novamente em instantes.",
+            headers={"Retry-After": str(settings.login_retry_after_seconds)},
+        )
+    LOGIN_IN_FLIGHT.inc()
+    LOGIN_QUEUE_DEPTH.inc()
+    submitted = time.perf_counter()
+
+    def run() -> bool:
+        LOGIN_QUEUE_DEPTH.dec()
+        LOGIN_QUEUE_WAIT_SECONDS.observe(time.perf_counter() - submitted)
+        return verify_password(plain_password, hashed_password)
+
+    try:
+        future = _get_login_executor().submit(run)
+    except BaseException:
+        LOGIN_QUEUE_DEPTH.dec()
+        _release_login_slot(None)
+        raise
+    # The slot is freed when the hash finishes, even if the client gave up and the await was cancelled.
+    future.add_done_callback(_release_login_slot)
+    return await asyncio.wrap_future(future)
+
+
+def shutdown_hashing_pool() -> None:
+    global _executor, _login_executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True, cancel_futures=True)
+            _executor = None
+        if _login_executor is not None:
+            _login_executor.shutdown(wait=True)
+            _login_executor = None
@@ -0,0 +1,228 @@
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from io import BytesIO
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from .bulk import bulk_create_users, bulk_delete_users
+from .config import get_settings
+from .database import SessionLocal
+from .models import ImportJob
+from .schemas import BulkUserResult
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_stopping = threading.Event()
+# Set once pending jobs have been handed to the executor; until then (database down or schema behind
+# at startup) the readiness check and the job routes retry.
+_resumed = threading.Event()
+
+
+class JobInterrupted(Exception):
+    pass
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=settings.import_job_workers, thread_name_prefix="import-job")
+        return _executor
+
+
+def create_job(db: Session, kind: str, content: bytes, requested_by: str) -> ImportJob:
+    ensure_jobs_resumed()
+    job = ImportJob(
+        kind=kind,
+        status="queued",
+        requested_by=requested_by,
+        file_content=content,
+        created=0 if kind == "bulk-create" else None,
+        deleted=0 if kind == "bulk-delete" else None,
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    _get_executor().submit(run_job, job.id)
+    return job
+
+
+def get_job(db: Session, job_id: str) -> Optional[ImportJob]:
+    ensure_jobs_resumed()
+    job = db.query(ImportJob).filter(ImportJob.id == job_id).first()
+    if job and _is_stale(job):
+        # The worker that owned this job went away; pick it up here.
+        _get_executor().submit(run_job, job.id)
+    return job
+
+
+def _stale_cutoff() -> datetime:
+    # Never closer than three heartbeats, so a live job is not taken over because of one slow beat.
+    seconds = max(settings.import_job_stale_seconds, 3 * settings.import_job_heartbeat_seconds)
+    return datetime.utcnow() - timedelta(seconds=seconds)
+
+
+def _is_stale(job: ImportJob) -> bool:
+    return job.status == "running" and (job.heartbeat_at is None or job.heartbeat_at < _stale_cutoff())
+
+
+def _claim(db: Session, job_id: str) -> bool:
+    claimable = or_(
+        ImportJob.status == "queued",
+        and_(
+            ImportJob.status == "running",
+            or_(ImportJob.heartbeat_at.is_(None), ImportJob.heartbeat_at < _stale_cutoff()),
+        ),
+    )
+    claimed = (
+        db.query(ImportJob)
+        .filter(ImportJob.id == job_id, claimable)
+        .update({ImportJob.status: "running", ImportJob.heartbeat_at: datetime.utcnow()}, synchronize_session=False)
+    )
+    db.commit()
+    return claimed == 1
+
+
+def _save_progress(db: Session, job_id: str, last_row: int, result: BulkUserResult) -> None:
+    values = {
+        ImportJob.last_row: last_row,
+        ImportJob.processed: result.processed,
+        ImportJob.skipped: result.skipped,
+        ImportJob.errors_json: json.dumps([error.model_dump() for error in result.errors]),
+        ImportJob.heartbeat_at: datetime.utcnow(),
+    }
+    if result.created is not None:
+        values[ImportJob.created] = result.created
+    if result.deleted is not None:
+        values[ImportJob.deleted] = result.deleted
+    db.query(ImportJob).filter(ImportJob.id == job_id).update(values, synchronize_session=False)
+    db.commit()
+
+
+def _finish(db: Session, job_id: str, status: str, detail: Optional[str] = None) -> None:
+    db.query(ImportJob).filter(ImportJob.id == job_id).update(
+        {
+            ImportJob.status: status,
+            ImportJob.detail: detail,
+            ImportJob.file_content: None,
+            ImportJob.finished_at: datetime.utcnow(),
+        },
+        synchronize_session=False,
+    )
+    db.commit()
+
+
+def _heartbeat(job_id: str, stop: threading.Event) -> None:
+    # Own session: job_db belongs to the thread running the import.
+    while not stop.wait(settings.import_job_heartbeat_seconds):
+        try:
+            with SessionLocal() as db:
+                db.query(ImportJob).filter(ImportJob.id == job_id, ImportJob.status == "running").update(
+                    {ImportJob.heartbeat_at: datetime.utcnow()},
+                    synchronize_session=False,
+                )
+                db.commit()
+        except SQLAlchemyError:
+            logger.warning("Could not refresh heartbeat of import job %s", job_id, exc_info=True)
+
+
+def run_job(job_id: str) -> None:
+    if _stopping.is_set():
+        return
+    with SessionLocal() as job_db, SessionLocal() as db:
+        if not _claim(job_db, job_id):
+            return
+        # A single chunk can outlast the stale threshold, so the heartbeat cannot wait for checkpoints.
+        stop_heartbeat = threading.Event()
+        heartbeat = threading.Thread(
+            target=_heartbeat, args=(job_id, stop_heartbeat), name="import-job-heartbeat", daemon=True
+        )
+        heartbeat.start()
+        try:
+            _run_claimed(job_db, db, job_id)
+        finally:
+            stop_heartbeat.set()
+            heartbeat.join()
+
+
+def _run_claimed(job_db: Session, db: Session, job_id: str) -> None:
+    job = job_db.query(ImportJob).filter(ImportJob.id == job_id).first()
+
+    def on_progress(last_row: int, result: BulkUserResult) -> None:
+        _save_progress(job_db, job_id, last_row, result)
+        if _stopping.is_set():
+            raise JobInterrupted()
+
+    try:
+        stream = BytesIO(job.file_content or b"")
+        if job.kind == "bulk-create":
+            resume_from = None
+            # Rows before the checkpoint are already committed; a later duplicate of one of them is
+            # then reported as an existing e-mail rather than a duplicate in the file.
+            if job.last_row > 1:
+                resume_from = (
+                    job.last_row,
+                    BulkUserResult(processed=job.processed, created=job.created, skipped=job.skipped, errors=job.errors),
+                )
+            result = bulk_create_users(db, stream, resume_from=resume_from, on_progress=on_progress)
+        else:
+            result = bulk_delete_users(db, stream, job.requested_by, on_progress=on_progress)
+        _save_progress(job_db, job_id, job.last_row, result)
+        _finish(job_db, job_id, "done")
+    except JobInterrupted:
+        # Leave the checkpoint in place and hand the job back to the queue for the next boot.
+        job_db.query(ImportJob).filter(ImportJob.id == job_id).update(
+            {ImportJob.status: "queued"},
+            synchronize_session=False,
+        )
+        job_db.commit()
+    except HTTPException as exc:
+        _finish(job_db, job_id, "failed", str(exc.detail))
+    except Exception:
+        logger.exception("Import job %s failed", job_id)
+        job_db.rollback()
+        _finish(job_db, job_id, "failed", "Erro ao processar arquivo.")
+
+
+def resume_jobs() -> None:
+    _stopping.clear()
+    try:
+        with SessionLocal() as db:
+            pending = (
+                db.query(ImportJob.id)
+                .filter(ImportJob.status.in_(["queued", "running"]))
+                .order_by(ImportJob.created_at.asc())
+                .all()
+            )
+    except SQLAlchemyError:
+        logger.warning("Could not resume import jobs; will retry", exc_info=True)
+        return
+    _resumed.set()
+    for (job_id,) in pending:
+        _get_executor().submit(run_job, job_id)
+
+
+def ensure_jobs_resumed() -> None:
+    # A job submitted twice is harmless: only one run_job wins the claim.
+    if not _resumed.is_set() and not _stopping.is_set():
+        resume_jobs()
+
+
+def shutdown_jobs() -> None:
+    global _executor
+    _stopping.set()
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True, cancel_futures=True)
+            _executor = None
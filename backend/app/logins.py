@@ -0,0 +1,114 @@
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import case, delete, insert, update
+
+from .config import get_settings
+from .database import engine
+from .metrics import LOGIN_BUFFER_FLUSHES
+from .models import LoginEvent, User
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+FLUSH_CHUNK_SIZE = 500
+PRUNE_INTERVAL_SECONDS = 3600
+
+
+class LoginRecorder:
+    # Collects successful logins in memory and writes them from a background thread, so the login
+    # request never waits on (or fails because of) these writes.
+    def __init__(self, interval: float, max_events: int):
+        self.interval = interval
+        self.max_events = max_events
+        self._last_login: dict[str, datetime] = {}
+        self._events: list[tuple[str, datetime]] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pruned_at = 0.0
+
+    def record(self, user_id: str, at: datetime) -> None:
+        with self._lock:
+            previous = self._last_login.get(user_id)
+            if previous is None or at > previous:
+                self._last_login[user_id] = at
+            if settings.login_history_enabled and len(self._events) < self.max_events:
+                self._events.append((user_id, at))
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._last_login)
+
+    def flush(self) -> None:
+        with self._flush_lock:
+            with self._lock:
+                last_login, self._last_login = self._last_login, {}
+                events, self._events = self._events, []
+            if not last_login and not events:
+                return
+            try:
+                self._write(last_login, events)
+                LOGIN_BUFFER_FLUSHES.labels("ok").inc()
+            except Exception:
+                LOGIN_BUFFER_FLUSHES.labels("error").inc()
+                logger.exception("Failed to flush %s login timestamps; keeping them for the next attempt", len(last_login))
+                self._requeue(last_login, events)
+
+    def _requeue(self, last_login: dict[str, datetime], events: list[tuple[str, datetime]]) -> None:
+        with self._lock:
+            for user_id, at in last_login.items():
+                newer = self._last_login.get(user_id)
+                if newer is None or at > newer:
+                    self._last_login[user_id] = at
+            # History is best effort: under a long outage the oldest events are dropped, not the process.
+            room = self.max_events - len(self._events)
+            if room > 0:
+                self._events[:0] = events[-room:]
+
+    def _write(self, last_login: dict[str, datetime], events: list[tuple[str, datetime]]) -> None:
+        users = User.__table__
+        items = list(last_login.items())
+        with engine.begin() as connection:
+            for start in range(0, len(items), FLUSH_CHUNK_SIZE):
+                chunk = dict(items[start:start + FLUSH_CHUNK_SIZE])
+                connection.execute(
+                    update(users)
+                    .where(users.c.id.in_(list(chunk)))
+                    .values(last_login_at=case(chunk, value=users.c.id))
+                )
+            if events:
+                connection.execute(
+                    insert(LoginEvent.__table__),
+                    [{"user_id": user_id, "logged_in_at": at} for user_id, at in events],
+                )
+            if settings.login_history_enabled and time.monotonic() - self._pruned_at > PRUNE_INTERVAL_SECONDS:
+                cutoff = datetime.utcnow() - timedelta(days=settings.login_history_days)
+                connection.execute(delete(LoginEvent.__table__).where(LoginEvent.logged_in_at < cutoff))
+                self._pruned_at = time.monotonic()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="login-recorder", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+
+login_recorder = LoginRecorder(settings.login_flush_seconds, settings.login_history_buffer_size)
@@ -1,36 +1,69 @@
 from datetime import datetime
 from io import BytesIO
+import logging
 import time
-from fastapi import Depends, FastAPI, File, HTTPException, Response, UploadFile, status
+from typing import Awaitable, Callable, Literal, Optional
+from fastapi import Depends, FastAPI, File, HTTPException, Query, Request, Response, UploadFile, status
 from fastapi.middleware.cors import CORSMiddleware
-from openpyxl import Workbook, load_workbook
-from sqlalchemy import inspect, text
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from openpyxl import Workbook
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.exc import OperationalError
 
-from .auth import create_access_token, get_current_user, hash_password, require_admin, verify_password
+from .auth import create_access_token, get_current_user_async, require_admin
+from .bulk import CREATE_HEADERS, CREATE_TEMPLATE_COLUMNS, DELETE_HEADERS, check_headers
+from .cache import CachedBody, portal_cache, user_cache
+from .coherence import PORTAL, USERS, content_versions
+from .compression import CompressionMiddleware
 from .config import get_settings
 from .crud import (
+    announcements_json,
+    courses_json,
     create_announcement,
     create_course,
     create_partner,
     create_user,
+    database_now_async,
     delete_announcement,
     delete_course,
     delete_partner,
-    get_portal_link,
+    delete_users,
     get_user_by_email,
     list_announcements,
     list_courses,
     list_partners,
-    list_portal_links,
     list_users,
+    login_activity,
+    partners_json,
+    get_user_by_email_async,
+    portal_announcements_json_async,
+    portal_bootstrap_json_async,
+    portal_courses_json_async,
+    portal_link_json_async,
+    portal_links_json_async,
+    portal_partners_json_async,
+    search_documents_async,
+    search_live_ids_async,
     update_announcement,
     update_course,
     update_partner,
     update_user,
+    update_user_password,
+    users_json,
 )
-from .database import Base, SessionLocal, engine, get_db
+from .database import async_engine, engine, get_async_db, get_async_read_db, get_db, read_async_engine
+from .export import iter_users_csv, iter_users_xlsx
+from .hashing import shutdown_hashing_pool, verify_login_password
+from .jobs import create_job, ensure_jobs_resumed, get_job, resume_jobs, shutdown_jobs
+from .logins import login_recorder
+from .migrate import migrate_and_seed, schema_status
+from .metrics import MetricsMiddleware, instrument_engine, render_metrics
+from .pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, decode_cursor, paginate
+from .querylog import install_query_log, query_stats
+from .search import SYNC_OVERLAP, search_index
 from . import models
 from .models import Announcement, Course
 from .schemas import (
@@ -40,21 +73,26 @@ from .schemas import (
     CourseCreate,
     CoursePublic,
     CourseUpdate,
+    LoginDayPublic,
     LoginRequest,
-    BulkUserResult,
+    ImportJobPublic,
     PartnerCreate,
     PartnerPublic,
     PartnerUpdate,
+    PortalBootstrap,
     PortalLinkPublic,
+    SearchResult,
     UserCreate,
     UserPasswordUpdate,
     UserPublic,
+    UserRole,
     UserUpdate,
 )
-from .seed import seed_all
 
 settings = get_settings()
 
+logger = logging.getLogger(__name__)
+
 app = FastAPI(title="Sou Arte em Cuidados API")
 
 origins = [origin.strip() for origin in settings.cors_origins.split(",") if origin.strip()]
@@ -64,86 +102,135 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(MetricsMiddleware)
+
+instrument_engine(engine, "primary")
+instrument_engine(async_engine.sync_engine, "async")
+if read_async_engine is not None:
+    instrument_engine(read_async_engine.sync_engine, "replica")
+if settings.query_log_enabled:
+    install_query_log(engine)
+    install_query_log(async_engine.sync_engine)
+    if read_async_engine is not None:
+        install_query_log(read_async_engine.sync_engine)
 
 
 @app.on_event("startup")
 def on_startup() -> None:
-    for _ in range(10):
-        try:
-            Base.metadata.create_all(bind=engine)
-            with engine.begin() as connection:
-                inspector = inspect(connection)
-                columns = {column["name"] for column in inspector.get_columns("announcements")}
-                if "expires_at" not in columns:
-                    connection.execute(text("ALTER TABLE announcements ADD COLUMN expires_at DATETIME NULL"))
-            with SessionLocal() as db:
-                seed_all(db)
+    login_recorder.start()
+    # Deploys migrate before starting workers (python -m app.migrate), so this is normally a single
+    # version read. MIGRATE_ON_STARTUP covers local runs; concurrent workers serialize on the lock.
+    try:
+        current, latest = schema_status(engine)
+    except OperationalError:
+        # Import jobs are resumed by the first /health/ready (or job request) that finds it ready.
+        logger.warning("Database unavailable at startup; /health/ready will report it")
+        return
+    if current < latest:
+        if not settings.migrate_on_startup:
+            logger.warning("Schema at version %s, expected %s; run python -m app.migrate", current, latest)
             return
-        except OperationalError:
-            time.sleep(2)
-    Base.metadata.create_all(bind=engine)
-    with SessionLocal() as db:
-        seed_all(db)
-
-
-CREATE_HEADERS = {
-    "name": ["nome", "name"],
-    "email": ["email", "e-mail", "e mail"],
-    "password": ["senha", "password"],
-    "role": ["perfil", "role", "tipo", "papel"],
-}
-
-DELETE_HEADERS = {
-    "email": ["email", "e-mail", "e mail"],
-}
-
-ROLE_ALIASES = {
-    "admin": "admin",
-    "administrador": "admin",
-    "adm": "admin",
-    "socio": "socio",
-    "sócio": "socio",
-    "associado": "socio",
-}
-
-
-def normalize_value(value: object) -> str:
-    if value is None:
-        return ""
-    return str(value).strip()
-
-
-def normalize_header(value: object) -> str:
-    return normalize_value(value).lower()
-
-
-def get_header_index(ws, required_headers: dict[str, list[str]]) -> dict[str, int]:
-    header_row = next(ws.iter_rows(min_row=1, max_row=1, values_only=True), None)
-    if not header_row:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Arquivo inválido. Cabeçalho não encontrado.")
-
-    index_map: dict[str, int] = {}
-    for idx, cell_value in enumerate(header_row):
-        header = normalize_header(cell_value)
-        for field, aliases in required_headers.items():
-            if header in aliases and field not in index_map:
-                index_map[field] = idx
-
-    missing = [field for field in required_headers.keys() if field not in index_map]
-    if missing:
-        missing_label = ", ".join(missing)
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Arquivo inválido. Colunas obrigatórias ausentes: {missing_label}.",
-        )
-    return index_map
+        migrate_and_seed(engine)
+    resume_jobs()
+
+
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    await run_in_threadpool(shutdown_jobs)
+    await run_in_threadpool(login_recorder.stop)
+    await run_in_threadpool(shutdown_hashing_pool)
+    await async_engine.dispose()
+    if read_async_engine is not None:
+        await read_async_engine.dispose()
+
+
+@app.get("/health/live", include_in_schema=False)
+def health_live():
+    return {"status": "ok"}
+
+
+@app.get("/health/ready", include_in_schema=False)
+def health_ready():
+    try:
+        current, latest = schema_status(engine)
+    except OperationalError as exc:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Banco de dados indisponível.") from exc
+    if current < latest:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Migrações pendentes.")
+    # Covers a worker that started while the database was down or not yet migrated.
+    ensure_jobs_resumed()
+    return {"status": "ok", "schema_version": current}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    content, media_type = render_metrics()
+    return Response(content=content, media_type=media_type)
+
+
+def content_tag(user_id: Optional[str] = None) -> Optional[str]:
+    # Portal bodies change only with the portal version or at a visibility boundary, which the ETag
+    # carries; a body that embeds the user also depends on the users version. The tag is the same on
+    # every worker and is known before anything is loaded.
+    if user_id is None:
+        versions = content_versions.current(PORTAL)
+        return None if versions is None else f"p{versions[0]}"
+    versions = content_versions.current(PORTAL, USERS)
+    return None if versions is None else f"p{versions[0]}.u{versions[1]}.{user_id}"
+
+
+def _matching_etag(request: Request, tag: str) -> Optional[str]:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return None
+    now = time.time()
+    for candidate in if_none_match.split(","):
+        etag = candidate.strip().removeprefix("W/")
+        base, _, until = etag.strip('"').partition("@")
+        if base == tag and (not until or (until.isdigit() and now < int(until))):
+            return "W/" + etag
+    return None
+
+
+async def cached_json_response(
+    request: Request,
+    load: Callable[[], Awaitable[CachedBody]],
+    user_id: Optional[str] = None,
+) -> Response:
+    headers = {"Cache-Control": "private, no-cache"}
+    tag = content_tag(user_id)
+    # "*" matches any current representation (RFC 9110 13.1.2); the body is still loaded, since only the
+    # loader knows whether one exists (a missing link answers 404).
+    wildcard = any(value.strip() == "*" for value in request.headers.get("if-none-match", "").split(","))
+    if tag is not None and not wildcard:
+        etag = _matching_etag(request, tag)
+        if etag:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={**headers, "ETag": etag})
+    body = await load()
+    if tag is not None:
+        # Weak on every path: the compression middleware may re-encode the body, so the tag can only
+        # promise equivalent content. Floored to the second, so it lapses no later than the body does.
+        headers["ETag"] = f'W/"{tag}@{int(body.until.timestamp())}"' if body.until else f'W/"{tag}"'
+    if wildcard:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body.content, media_type="application/json", headers=headers)
+
+
+def json_rows_response(response: Response, body: bytes) -> Response:
+    # Returning a Response skips response_model validation and encoding; crud already validated the
+    # rows against the matching *Row adapter. Only the pagination header is carried over.
+    cursor = response.headers.get(NEXT_CURSOR_HEADER)
+    return Response(content=body, media_type="application/json", headers={NEXT_CURSOR_HEADER: cursor} if cursor else None)
 
 
 @app.post("/auth/login", response_model=UserPublic)
-def login(payload: LoginRequest, response: Response, db: Session = Depends(get_db)):
-    user = get_user_by_email(db, payload.email)
-    if not user or not verify_password(payload.password, user.password_hash):
+async def login(payload: LoginRequest, response: Response, db: AsyncSession = Depends(get_async_db)):
+    user = await get_user_by_email_async(db, payload.email)
+    # bcrypt is CPU-bound; it runs on the bounded login executor, which answers 503 when saturated.
+    if not user or not await verify_login_password(payload.password, user.password_hash):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Credenciais inválidas.")
     if not user.active:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Usuário inativo.")
@@ -157,8 +244,12 @@ def login(payload: LoginRequest, response: Response, db: Session = Depends(get_d
         samesite="lax",
         max_age=settings.access_token_expire_minutes * 60,
     )
-    user.last_login_at = datetime.utcnow()
-    db.commit()
+    # Written behind by login_recorder; a failed flush is logged and retried, never surfaced here.
+    # The returned user still shows this login, as when it was committed inline, without dirtying the
+    # session.
+    now = datetime.utcnow()
+    login_recorder.record(user.id, now)
+    set_committed_value(user, "last_login_at", now)
     return user
 
 
@@ -169,13 +260,25 @@ def logout(response: Response):
 
 
 @app.get("/auth/me", response_model=UserPublic)
-def me(current_user=Depends(get_current_user)):
+async def me(current_user=Depends(get_current_user_async)):
     return current_user
 
 
 @app.get("/admin/users", response_model=list[UserPublic])
-def admin_list_users(_: str = Depends(require_admin), db: Session = Depends(get_db)):
-    return list_users(db)
+def admin_list_users(
+    response: Response,
+    role: Optional[UserRole] = None,
+    active: Optional[bool] = None,
+    q: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    _: str = Depends(require_admin),
+    db: Session = Depends(get_db),
+):
+    after = decode_cursor(cursor, (datetime.fromisoformat, str))
+    users = list_users(db, role, active, q.strip() if q else None, limit + 1, after)
+    page = paginate(response, users, limit, lambda user: (user["created_at"], user["id"]))
+    return json_rows_response(response, users_json(page))
 
 
 @app.post("/admin/users", response_model=UserPublic)
@@ -207,10 +310,7 @@ def admin_update_user_password(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Usuário não encontrado.")
     if not payload.password.strip():
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Senha inválida.")
-    user.password_hash = hash_password(payload.password.strip())
-    db.commit()
-    db.refresh(user)
-    return user
+    return update_user_password(db, user, payload.password.strip())
 
 
 @app.delete("/admin/users/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -225,16 +325,7 @@ def admin_delete_user(
     if user.id == current_user.id:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Não é possível excluir o usuário logado.")
     try:
-        db.query(Announcement).filter(Announcement.created_by == user.id).update(
-            {Announcement.created_by: None},
-            synchronize_session=False,
-        )
-        db.query(Course).filter(Course.created_by == user.id).update(
-            {Course.created_by: None},
-            synchronize_session=False,
-        )
-        db.delete(user)
-        db.commit()
+        delete_users(db, [user.id])
     except Exception as exc:
         db.rollback()
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Erro ao excluir usuário.") from exc
@@ -246,7 +337,7 @@ def admin_users_template_create(_: str = Depends(require_admin)):
     workbook = Workbook()
     sheet = workbook.active
     sheet.title = "usuarios"
-    sheet.append(["nome", "email", "senha", "perfil"])
+    sheet.append(CREATE_TEMPLATE_COLUMNS)
     stream = BytesIO()
     workbook.save(stream)
     stream.seek(0)
@@ -257,6 +348,24 @@ def admin_users_template_create(_: str = Depends(require_admin)):
     )
 
 
+@app.get("/admin/users/export")
+def admin_export_users(
+    format: Literal["xlsx", "csv"] = Query("xlsx"),
+    _: str = Depends(require_admin),
+):
+    if format == "csv":
+        return StreamingResponse(
+            iter_users_csv(),
+            media_type="text/csv; charset=utf-8",
+            headers={"Content-Disposition": 'attachment; filename="usuarios.csv"'},
+        )
+    return StreamingResponse(
+        iter_users_xlsx(),
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        headers={"Content-Disposition": 'attachment; filename="usuarios.xlsx"'},
+    )
+
+
 @app.get("/admin/users/templates/delete")
 def admin_users_template_delete(_: str = Depends(require_admin)):
     workbook = Workbook()
@@ -273,67 +382,21 @@ def admin_users_template_delete(_: str = Depends(require_admin)):
     )
 
 
-@app.post("/admin/users/bulk-create", response_model=BulkUserResult)
+@app.post("/admin/users/bulk-create", response_model=ImportJobPublic, status_code=status.HTTP_202_ACCEPTED)
 def admin_bulk_create_users(
     file: UploadFile = File(...),
-    _: str = Depends(require_admin),
+    current_user=Depends(require_admin),
     db: Session = Depends(get_db),
 ):
     if not file.filename or not file.filename.endswith(".xlsx"):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Envie um arquivo .xlsx.")
 
+    check_headers(file.file, CREATE_HEADERS)
     file.file.seek(0)
-    workbook = load_workbook(file.file, data_only=True)
-    sheet = workbook.active
-    header_index = get_header_index(sheet, CREATE_HEADERS)
-
-    processed = 0
-    created = 0
-    skipped = 0
-    errors: list[dict[str, object]] = []
-    seen_emails: set[str] = set()
-
-    for row_number, row in enumerate(sheet.iter_rows(min_row=2, values_only=True), start=2):
-        values = {field: row[index] if index < len(row) else None for field, index in header_index.items()}
-        if all(normalize_value(value) == "" for value in values.values()):
-            continue
-
-        processed += 1
-        name = normalize_value(values["name"])
-        email = normalize_value(values["email"]).lower()
-        password = normalize_value(values["password"])
-        role_raw = normalize_value(values["role"]).lower()
-        role = ROLE_ALIASES.get(role_raw)
-
-        if not name or not email or not password or not role:
-            errors.append({"row": row_number, "message": "Campos obrigatórios ausentes ou perfil inválido."})
-            skipped += 1
-            continue
-
-        if email in seen_emails:
-            errors.append({"row": row_number, "message": "E-mail duplicado no arquivo."})
-            skipped += 1
-            continue
-
-        seen_emails.add(email)
-
-        if get_user_by_email(db, email):
-            errors.append({"row": row_number, "message": "E-mail já cadastrado."})
-            skipped += 1
-            continue
-
-        try:
-            create_user(db, name, email, password, role)
-            created += 1
-        except Exception:
-            db.rollback()
-            errors.append({"row": row_number, "message": "Erro ao criar usuário."})
-            skipped += 1
-
-    return BulkUserResult(processed=processed, created=created, skipped=skipped, errors=errors)
+    return create_job(db, "bulk-create", file.file.read(), current_user.id)
 
 
-@app.post("/admin/users/bulk-delete", response_model=BulkUserResult)
+@app.post("/admin/users/bulk-delete", response_model=ImportJobPublic, status_code=status.HTTP_202_ACCEPTED)
 def admin_bulk_delete_users(
     file: UploadFile = File(...),
     current_user=Depends(require_admin),
@@ -342,57 +405,58 @@ def admin_bulk_delete_users(
     if not file.filename or not file.filename.endswith(".xlsx"):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Envie um arquivo .xlsx.")
 
+    check_headers(file.file, DELETE_HEADERS)
     file.file.seek(0)
-    workbook = load_workbook(file.file, data_only=True)
-    sheet = workbook.active
-    header_index = get_header_index(sheet, DELETE_HEADERS)
-
-    processed = 0
-    deleted = 0
-    skipped = 0
-    errors: list[dict[str, object]] = []
-
-    for row_number, row in enumerate(sheet.iter_rows(min_row=2, values_only=True), start=2):
-        email_value = row[header_index["email"]] if header_index["email"] < len(row) else None
-        email = normalize_value(email_value).lower()
-        if not email:
-            continue
-
-        processed += 1
-        user = get_user_by_email(db, email)
-        if not user:
-            errors.append({"row": row_number, "message": "Usuário não encontrado."})
-            skipped += 1
-            continue
-
-        if user.id == current_user.id:
-            errors.append({"row": row_number, "message": "Não é possível excluir o usuário logado."})
-            skipped += 1
-            continue
+    return create_job(db, "bulk-delete", file.file.read(), current_user.id)
+
+
+@app.get("/admin/jobs/{job_id}", response_model=ImportJobPublic)
+def admin_get_job(job_id: str, _: str = Depends(require_admin), db: Session = Depends(get_db)):
+    job = get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Processamento não encontrado.")
+    return job
 
-        try:
-            db.query(Announcement).filter(Announcement.created_by == user.id).update(
-                {Announcement.created_by: None},
-                synchronize_session=False,
-            )
-            db.query(Course).filter(Course.created_by == user.id).update(
-                {Course.created_by: None},
-                synchronize_session=False,
-            )
-            db.delete(user)
-            db.commit()
-            deleted += 1
-        except Exception:
-            db.rollback()
-            errors.append({"row": row_number, "message": "Erro ao excluir usuário."})
-            skipped += 1
-
-    return BulkUserResult(processed=processed, deleted=deleted, skipped=skipped, errors=errors)
+
+@app.get("/admin/cache/stats")
+def admin_cache_stats(_: str = Depends(require_admin)):
+    return {"portal": portal_cache.stats(), "users": user_cache.stats(), "versions": content_versions.stats()}
+
+
+@app.get("/admin/logins/daily", response_model=list[LoginDayPublic])
+def admin_login_activity(
+    days: int = Query(30, ge=1, le=365),
+    _: str = Depends(require_admin),
+    db: Session = Depends(get_db),
+):
+    return login_activity(db, days)
+
+
+@app.get("/admin/queries/top")
+def admin_top_queries(
+    limit: int = Query(20, ge=1, le=200),
+    sort: Literal["total", "count", "p95", "max", "mean"] = "total",
+    _: str = Depends(require_admin),
+):
+    if not settings.query_log_enabled:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Registro de consultas desativado.")
+    return query_stats.top(limit, sort)
 
 
 @app.get("/admin/announcements", response_model=list[AnnouncementPublic])
-def admin_list_announcements(_: str = Depends(require_admin), db: Session = Depends(get_db)):
-    return list_announcements(db, only_active=False)
+def admin_list_announcements(
+    response: Response,
+    active: Optional[bool] = None,
+    visible: Optional[bool] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    _: str = Depends(require_admin),
+    db: Session = Depends(get_db),
+):
+    after = decode_cursor(cursor, (datetime.fromisoformat, str))
+    announcements = list_announcements(db, active, visible, limit + 1, after)
+    page = paginate(response, announcements, limit, lambda item: (item["published_at"], item["id"]))
+    return json_rows_response(response, announcements_json(page))
 
 
 @app.post("/admin/announcements", response_model=AnnouncementPublic)
@@ -441,8 +505,17 @@ def admin_delete_announcement(announcement_id: str, _: str = Depends(require_adm
 
 
 @app.get("/admin/courses", response_model=list[CoursePublic])
-def admin_list_courses(_: str = Depends(require_admin), db: Session = Depends(get_db)):
-    return list_courses(db, only_active=False)
+def admin_list_courses(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    _: str = Depends(require_admin),
+    db: Session = Depends(get_db),
+):
+    after = decode_cursor(cursor, (datetime.fromisoformat, str))
+    courses = list_courses(db, only_active=False, limit=limit + 1, after=after)
+    page = paginate(response, courses, limit, lambda item: (item["created_at"], item["id"]))
+    return json_rows_response(response, courses_json(page))
 
 
 @app.post("/admin/courses", response_model=CoursePublic)
@@ -477,8 +550,17 @@ def admin_delete_course(course_id: str, _: str = Depends(require_admin), db: Ses
 
 
 @app.get("/admin/partners", response_model=list[PartnerPublic])
-def admin_list_partners(_: str = Depends(require_admin), db: Session = Depends(get_db)):
-    return list_partners(db, only_active=False)
+def admin_list_partners(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    _: str = Depends(require_admin),
+    db: Session = Depends(get_db),
+):
+    after = decode_cursor(cursor, (str, str))
+    partners = list_partners(db, only_active=False, limit=limit + 1, after=after)
+    page = paginate(response, partners, limit, lambda item: (item["name"], item["id"]))
+    return json_rows_response(response, partners_json(page))
 
 
 @app.post("/admin/partners", response_model=PartnerPublic)
@@ -508,29 +590,104 @@ def admin_delete_partner(partner_id: str, _: str = Depends(require_admin), db: S
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
+@app.get("/portal/bootstrap", response_model=PortalBootstrap)
+async def portal_bootstrap(
+    request: Request,
+    current_user=Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    return await cached_json_response(request, lambda: portal_bootstrap_json_async(db, current_user), current_user.id)
+
+
+@app.get("/portal/search", response_model=list[SearchResult])
+async def portal_search(
+    q: str = Query(min_length=1, max_length=200),
+    limit: int = Query(default=20, ge=1, le=100),
+    _: str = Depends(get_current_user_async),
+    # The index is loaded once and then kept current by this process's own writes, so it must not
+    # start from a replica snapshot that may be behind.
+    db: AsyncSession = Depends(get_async_db),
+):
+    if not search_index.loaded:
+        token = search_index.begin_load()
+        try:
+            read_at = await database_now_async(db)
+            documents = await search_documents_async(db)
+            await run_in_threadpool(search_index.finish_load, documents, token, read_at)
+        except BaseException:
+            search_index.cancel_load()
+            raise
+    elif search_index.stale and (token := search_index.begin_sync()) is not None:
+        # Another process wrote: re-index only the rows changed since the last read.
+        try:
+            since = search_index.read_at - SYNC_OVERLAP if search_index.read_at else None
+            read_at = await database_now_async(db)
+            changed = await search_documents_async(db, since)
+            live = await search_live_ids_async(db)
+            await run_in_threadpool(search_index.finish_sync, changed, live, token, read_at)
+        except BaseException:
+            search_index.cancel_load()
+            raise
+    return [
+        SearchResult(
+            kind=hit.document.kind,
+            id=hit.document.id,
+            title=hit.document.title,
+            snippet=hit.document.snippet,
+            date=hit.document.date,
+            score=round(hit.score, 4),
+        )
+        for hit in search_index.search(q, limit)
+    ]
+
+
 @app.get("/portal/announcements", response_model=list[AnnouncementPublic])
-def portal_announcements(_: str = Depends(get_current_user), db: Session = Depends(get_db)):
-    return list_announcements(db, only_active=True, only_visible=True)
+async def portal_announcements(
+    request: Request,
+    _: str = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    return await cached_json_response(request, lambda: portal_announcements_json_async(db))
 
 
 @app.get("/portal/courses", response_model=list[CoursePublic])
-def portal_courses(_: str = Depends(get_current_user), db: Session = Depends(get_db)):
-    return list_courses(db, only_active=True)
+async def portal_courses(
+    request: Request,
+    _: str = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    return await cached_json_response(request, lambda: portal_courses_json_async(db))
 
 
 @app.get("/portal/links", response_model=list[PortalLinkPublic])
-def portal_links(_: str = Depends(get_current_user), db: Session = Depends(get_db)):
-    return list_portal_links(db)
+async def portal_links(
+    request: Request,
+    _: str = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    return await cached_json_response(request, lambda: portal_links_json_async(db))
 
 
 @app.get("/portal/links/{slug}", response_model=PortalLinkPublic)
-def portal_link(slug: str, _: str = Depends(get_current_user), db: Session = Depends(get_db)):
-    link = get_portal_link(db, slug)
-    if not link:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Link não encontrado.")
-    return link
+async def portal_link(
+    slug: str,
+    request: Request,
+    _: str = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    async def load() -> CachedBody:
+        link = await portal_link_json_async(db, slug)
+        if not link:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Link não encontrado.")
+        return link
+
+    return await cached_json_response(request, load)
 
 
 @app.get("/portal/partners", response_model=list[PartnerPublic])
-def portal_partners(_: str = Depends(get_current_user), db: Session = Depends(get_db)):
-    return list_partners(db, only_active=True)
+async def portal_partners(
+    request: Request,
+    _: str = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    return await cached_json_response(request, lambda: portal_partners_json_async(db))
@@ -0,0 +1,193 @@
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+
+REQUESTS = Counter("http_requests_total", "HTTP requests by route template.", ["method", "route", "status"])
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUEST_DB_STATEMENTS = Histogram(
+    "http_request_db_statements",
+    "SQL statements issued per HTTP request.",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100, 250),
+)
+REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds",
+    "Time spent executing SQL per HTTP request.",
+    ["route"],
+    buckets=DB_BUCKETS,
+)
+DB_STATEMENTS = Counter("db_statements_total", "SQL statements executed.", ["engine"])
+DB_STATEMENT_SECONDS = Histogram(
+    "db_statement_duration_seconds",
+    "SQL statement execution time.",
+    ["engine"],
+    buckets=DB_BUCKETS,
+)
+POOL_CHECKOUT_SECONDS = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled connection.",
+    ["engine"],
+    buckets=DB_BUCKETS,
+)
+PASSWORD_SECONDS = Histogram(
+    "password_hash_duration_seconds",
+    "Time spent in bcrypt hashing and verification.",
+    ["operation"],
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+LOGIN_QUEUE_DEPTH = Gauge("login_verify_queue_depth", "Login verifications waiting for a worker.")
+LOGIN_IN_FLIGHT = Gauge("login_verify_in_flight", "Login verifications admitted and not yet finished.")
+LOGIN_QUEUE_WAIT_SECONDS = Histogram(
+    "login_verify_queue_wait_seconds",
+    "Time a login verification waited for a worker.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+LOGIN_REJECTED = Counter("login_verify_rejected_total", "Logins rejected because the verification queue was full.")
+DB_READ_ROUTES = Counter("db_read_routes_total", "Read sessions opened, by where they were routed.", ["target"])
+LOGIN_BUFFER_FLUSHES = Counter("login_buffer_flush_total", "Write-behind flushes of login timestamps.", ["result"])
+
+
+class RequestContext:
+    __slots__ = ("scope", "statements", "db_seconds")
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.statements = 0
+        self.db_seconds = 0.0
+
+    @property
+    def route(self) -> str:
+        # Label by route template, not the raw path, to keep cardinality bounded.
+        route = self.scope.get("route")
+        return getattr(route, "path", None) or "unmatched"
+
+
+# The context object is shared with threadpool workers, since run_in_threadpool copies the
+# contextvars mapping (not the values), so counters updated there land on the same request.
+_current_request: ContextVar[Optional[RequestContext]] = ContextVar("current_request", default=None)
+
+
+def current_request() -> Optional[RequestContext]:
+    return _current_request.get()
+
+
+class _TimedCheckoutMixin:
+    metrics_label = "primary"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_CHECKOUT_SECONDS.labels(self.metrics_label).observe(time.perf_counter() - started)
+
+
+class TimedQueuePool(_TimedCheckoutMixin, QueuePool):
+    metrics_label = "primary"
+
+
+class TimedAsyncQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    metrics_label = "async"
+
+
+# The label must match the one given to instrument_engine for the read replica engine.
+class TimedReplicaQueuePool(TimedAsyncQueuePool):
+    metrics_label = "replica"
+
+
+_engines: dict[str, Engine] = {}
+
+
+class _PoolCollector:
+    def collect(self):
+        checked_out = GaugeMetricFamily("db_pool_checked_out", "Connections currently checked out.", labels=["engine"])
+        overflow = GaugeMetricFamily("db_pool_overflow", "Connections open beyond pool_size.", labels=["engine"])
+        size = GaugeMetricFamily("db_pool_size", "Configured pool size.", labels=["engine"])
+        for label, engine in _engines.items():
+            pool = engine.pool
+            if isinstance(pool, QueuePool):
+                checked_out.add_metric([label], pool.checkedout())
+                overflow.add_metric([label], max(pool.overflow(), 0))
+                size.add_metric([label], pool.size())
+        yield checked_out
+        yield overflow
+        yield size
+
+
+REGISTRY.register(_PoolCollector())
+
+
+def instrument_engine(engine: Engine, label: str) -> None:
+    _engines[label] = engine
+    statements = DB_STATEMENTS.labels(label)
+    durations = DB_STATEMENT_SECONDS.labels(label)
+
+    # The start time lives on the execution context, which is discarded with the statement; a
+    # statement that raises never reaches after_cursor_execute, so nothing is left behind.
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._metrics_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_metrics_started", None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        statements.inc()
+        durations.observe(elapsed)
+        current = _current_request.get()
+        if current is not None:
+            current.statements += 1
+            current.db_seconds += elapsed
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+        context = RequestContext(scope)
+        token = _current_request.set(context)
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_request.reset(token)
+            template = context.route
+            method = scope["method"]
+            REQUESTS.labels(method, template, str(status_code)).inc()
+            REQUEST_SECONDS.labels(method, template).observe(time.perf_counter() - started)
+            REQUEST_DB_STATEMENTS.labels(template).observe(context.statements)
+            REQUEST_DB_SECONDS.labels(template).observe(context.db_seconds)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -0,0 +1,115 @@
+import logging
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, insert, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError
+
+from .migrations import MIGRATIONS
+
+logger = logging.getLogger(__name__)
+
+LOCK_NAME = "souarte_schema_migrations"
+LOCK_TIMEOUT_SECONDS = 300
+CONNECT_ATTEMPTS = 30
+CONNECT_DELAY_SECONDS = 2
+
+metadata = MetaData()
+
+schema_version = Table(
+    "schema_version",
+    metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String(100), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def latest_version() -> int:
+    return len(MIGRATIONS)
+
+
+def current_version(connection: Connection) -> int:
+    if not inspect(connection).has_table(schema_version.name):
+        return 0
+    return connection.execute(select(func.max(schema_version.c.version))).scalar() or 0
+
+
+def schema_status(engine: Engine) -> tuple[int, int]:
+    with engine.connect() as connection:
+        return current_version(connection), latest_version()
+
+
+@contextmanager
+def migration_lock(connection: Connection):
+    if connection.dialect.name != "mysql":
+        # SQLite serializes writers on its own and is only used for local runs and benchmarks.
+        yield
+        return
+    acquired = connection.execute(text("SELECT GET_LOCK(:name, :timeout)"), {"name": LOCK_NAME, "timeout": LOCK_TIMEOUT_SECONDS}).scalar()
+    connection.commit()
+    if acquired != 1:
+        raise RuntimeError("Timed out waiting for the schema migration lock.")
+    try:
+        yield
+    finally:
+        connection.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": LOCK_NAME})
+        connection.commit()
+
+
+def apply_migrations(engine: Engine) -> list[int]:
+    applied: list[int] = []
+    with engine.connect() as connection, migration_lock(connection):
+        metadata.create_all(bind=connection, checkfirst=True)
+        connection.commit()
+        # Re-read under the lock: another process may have migrated while this one waited.
+        version = current_version(connection)
+        connection.commit()
+        for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+            name = migration.__name__.rsplit(".", 1)[-1]
+            logger.info("Applying migration %s (%s)", number, name)
+            # MySQL commits DDL implicitly, which is why every migration is written to be re-runnable.
+            with connection.begin():
+                migration.upgrade(connection)
+                connection.execute(insert(schema_version).values(version=number, name=name, applied_at=datetime.utcnow()))
+            applied.append(number)
+    return applied
+
+
+def wait_for_database(engine: Engine, attempts: int = CONNECT_ATTEMPTS) -> None:
+    last_error: Optional[OperationalError] = None
+    for _ in range(attempts):
+        try:
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+            return
+        except OperationalError as exc:
+            last_error = exc
+            time.sleep(CONNECT_DELAY_SECONDS)
+    raise last_error
+
+
+def migrate_and_seed(engine: Engine) -> list[int]:
+    from .database import SessionLocal
+    from .seed import seed_all
+
+    applied = apply_migrations(engine)
+    with SessionLocal() as db:
+        seed_all(db)
+    return applied
+
+
+def main() -> None:
+    from .database import engine
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+    wait_for_database(engine)
+    applied = migrate_and_seed(engine)
+    logger.info("Schema at version %s (%s applied)", latest_version(), len(applied))
+
+
+if __name__ == "__main__":
+    main()
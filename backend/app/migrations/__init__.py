@@ -0,0 +1,22 @@
+from . import (
+    m0001_baseline,
+    m0002_announcement_expires_at,
+    m0003_listing_indexes,
+    m0004_import_jobs,
+    m0005_portal_visibility_indexes,
+    m0006_login_events,
+    m0007_content_versions,
+    m0008_users_active_index,
+)
+
+# Applied in order; a migration's version is its position in this list. Append only.
+MIGRATIONS = [
+    m0001_baseline,
+    m0002_announcement_expires_at,
+    m0003_listing_indexes,
+    m0004_import_jobs,
+    m0005_portal_visibility_indexes,
+    m0006_login_events,
+    m0007_content_versions,
+    m0008_users_active_index,
+]
@@ -0,0 +1,79 @@
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, MetaData, String, Table, Text, func
+from sqlalchemy.engine import Connection
+
+# Frozen copy of the tables as they shipped before migrations existed. Databases created by the
+# old create_all startup already have them, so every table is created only if missing.
+metadata = MetaData()
+
+Table(
+    "users",
+    metadata,
+    Column("id", String(36), primary_key=True),
+    Column("name", String(120), nullable=False),
+    Column("email", String(160), unique=True, index=True, nullable=False),
+    Column("password_hash", String(255), nullable=False),
+    Column("role", String(20), nullable=False),
+    Column("active", Boolean, nullable=False),
+    Column("created_at", DateTime, server_default=func.now(), nullable=False),
+    Column("updated_at", DateTime, server_default=func.now(), nullable=False),
+    Column("last_login_at", DateTime, nullable=True),
+)
+
+Table(
+    "announcements",
+    metadata,
+    Column("id", String(36), primary_key=True),
+    Column("title", String(200), nullable=False),
+    Column("body", Text, nullable=False),
+    Column("published_at", DateTime, nullable=False),
+    Column("expires_at", DateTime, nullable=True),
+    Column("is_active", Boolean, nullable=False),
+    Column("created_at", DateTime, server_default=func.now(), nullable=False),
+    Column("updated_at", DateTime, server_default=func.now(), nullable=False),
+    Column("created_by", String(36), ForeignKey("users.id"), nullable=True),
+)
+
+Table(
+    "courses",
+    metadata,
+    Column("id", String(36), primary_key=True),
+    Column("title", String(200), nullable=False),
+    Column("description", Text, nullable=False),
+    Column("image_url", String(500), nullable=True),
+    Column("access_url", String(500), nullable=False),
+    Column("is_active", Boolean, nullable=False),
+    Column("created_at", DateTime, server_default=func.now(), nullable=False),
+    Column("updated_at", DateTime, server_default=func.now(), nullable=False),
+    Column("created_by", String(36), ForeignKey("users.id"), nullable=True),
+)
+
+Table(
+    "portal_links",
+    metadata,
+    Column("id", String(36), primary_key=True),
+    Column("slug", String(50), unique=True, nullable=False),
+    Column("title", String(200), nullable=False),
+    Column("description", Text, nullable=False),
+    Column("body", Text, nullable=False),
+    Column("link_url", String(500), nullable=False),
+    Column("is_active", Boolean, nullable=False),
+    Column("created_at", DateTime, server_default=func.now(), nullable=False),
+    Column("updated_at", DateTime, server_default=func.now(), nullable=False),
+)
+
+Table(
+    "partners",
+    metadata,
+    Column("id", String(36), primary_key=True),
+    Column("name", String(200), nullable=False),
+    Column("description", Text, nullable=False),
+    Column("link_url", String(500), nullable=False),
+    Column("logo_url", String(500), nullable=True),
+    Column("is_active", Boolean, nullable=False),
+    Column("created_at", DateTime, server_default=func.now(), nullable=False),
+    Column("updated_at", DateTime, server_default=func.now(), nullable=False),
+)
+
+
+def upgrade(connection: Connection) -> None:
+    metadata.create_all(bind=connection, checkfirst=True)
@@ -0,0 +1,9 @@
+from sqlalchemy import Column, DateTime
+from sqlalchemy.engine import Connection
+
+from .ops import add_column
+
+
+# Replaces the ALTER the old startup ran for databases created before announcements could expire.
+def upgrade(connection: Connection) -> None:
+    add_column(connection, "announcements", Column("expires_at", DateTime, nullable=True))
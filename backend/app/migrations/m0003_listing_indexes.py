@@ -0,0 +1,13 @@
+from sqlalchemy.engine import Connection
+
+from .ops import create_index
+
+
+def upgrade(connection: Connection) -> None:
+    create_index(connection, "users", "ix_users_created_at_id", "created_at", "id")
+    create_index(connection, "users", "ix_users_role_active_created_at_id", "role", "active", "created_at", "id")
+    create_index(connection, "users", "ix_users_name", "name")
+    create_index(connection, "announcements", "ix_announcements_published_at_id", "published_at", "id")
+    create_index(connection, "announcements", "ix_announcements_is_active_published_at_id", "is_active", "published_at", "id")
+    create_index(connection, "courses", "ix_courses_created_at_id", "created_at", "id")
+    create_index(connection, "partners", "ix_partners_name_id", "name", "id")
@@ -0,0 +1,29 @@
+from sqlalchemy import Column, DateTime, Integer, LargeBinary, MetaData, String, Table, Text, func
+from sqlalchemy.engine import Connection
+
+metadata = MetaData()
+
+Table(
+    "import_jobs",
+    metadata,
+    Column("id", String(36), primary_key=True),
+    Column("kind", String(20), nullable=False),
+    Column("status", String(20), nullable=False),
+    Column("requested_by", String(36), nullable=True),
+    Column("file_content", LargeBinary(length=(2**32) - 1), nullable=True),
+    Column("last_row", Integer, nullable=False),
+    Column("processed", Integer, nullable=False),
+    Column("created", Integer, nullable=True),
+    Column("deleted", Integer, nullable=True),
+    Column("skipped", Integer, nullable=False),
+    Column("errors_json", Text(length=(2**32) - 1), nullable=False),
+    Column("detail", String(255), nullable=True),
+    Column("heartbeat_at", DateTime, nullable=True),
+    Column("finished_at", DateTime, nullable=True),
+    Column("created_at", DateTime, server_default=func.now(), nullable=False),
+    Column("updated_at", DateTime, server_default=func.now(), nullable=False),
+)
+
+
+def upgrade(connection: Connection) -> None:
+    metadata.create_all(bind=connection, checkfirst=True)
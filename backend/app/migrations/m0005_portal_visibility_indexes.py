@@ -0,0 +1,11 @@
+from sqlalchemy.engine import Connection
+
+from .ops import create_index, drop_index
+
+
+def upgrade(connection: Connection) -> None:
+    create_index(connection, "announcements", "ix_announcements_visible", "is_active", "published_at", "id", "expires_at")
+    # Left prefix of ix_announcements_visible, so it only costs writes now.
+    drop_index(connection, "announcements", "ix_announcements_is_active_published_at_id")
+    create_index(connection, "courses", "ix_courses_is_active_created_at_id", "is_active", "created_at", "id")
+    create_index(connection, "partners", "ix_partners_is_active_name_id", "is_active", "name", "id")
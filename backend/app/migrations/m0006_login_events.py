@@ -0,0 +1,18 @@
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, MetaData, String, Table
+from sqlalchemy.engine import Connection
+
+metadata = MetaData()
+
+Table(
+    "login_events",
+    metadata,
+    Column("id", BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True),
+    Column("user_id", String(36), nullable=False),
+    Column("logged_in_at", DateTime, nullable=False),
+    Index("ix_login_events_logged_in_at", "logged_in_at"),
+    Index("ix_login_events_user_id_logged_in_at", "user_id", "logged_in_at"),
+)
+
+
+def upgrade(connection: Connection) -> None:
+    metadata.create_all(bind=connection, checkfirst=True)
@@ -0,0 +1,22 @@
+from sqlalchemy import BigInteger, Column, DateTime, MetaData, String, Table, func, select
+from sqlalchemy.engine import Connection
+
+metadata = MetaData()
+
+content_versions = Table(
+    "content_versions",
+    metadata,
+    Column("name", String(32), primary_key=True),
+    Column("version", BigInteger, nullable=False, default=0),
+    Column("updated_at", DateTime, server_default=func.now(), nullable=False),
+)
+
+NAMES = ("portal", "users")
+
+
+def upgrade(connection: Connection) -> None:
+    metadata.create_all(bind=connection, checkfirst=True)
+    existing = set(connection.scalars(select(content_versions.c.name)))
+    missing = [{"name": name, "version": 0} for name in NAMES if name not in existing]
+    if missing:
+        connection.execute(content_versions.insert(), missing)
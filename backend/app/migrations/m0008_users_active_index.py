@@ -0,0 +1,8 @@
+from sqlalchemy.engine import Connection
+
+from .ops import create_index
+
+
+def upgrade(connection: Connection) -> None:
+    # The admin list filters on active alone; ix_users_role_active_created_at_id leads with role.
+    create_index(connection, "users", "ix_users_active_created_at_id", "active", "created_at", "id")
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Index, MetaData, Table, inspect
+from sqlalchemy.engine import Connection
+
+
+def table_exists(connection: Connection, table: str) -> bool:
+    return inspect(connection).has_table(table)
+
+
+def add_column(connection: Connection, table: str, column: Column) -> None:
+    columns = {existing["name"] for existing in inspect(connection).get_columns(table)}
+    if column.name in columns:
+        return
+    column_type = column.type.compile(dialect=connection.dialect)
+    nullable = "NULL" if column.nullable else "NOT NULL"
+    connection.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {column.name} {column_type} {nullable}")
+
+
+def create_index(connection: Connection, table: str, name: str, *columns: str) -> None:
+    existing = {index["name"] for index in inspect(connection).get_indexes(table)}
+    if name in existing:
+        return
+    reflected = Table(table, MetaData(), autoload_with=connection)
+    Index(name, *(reflected.c[column] for column in columns)).create(connection)
+
+
+def drop_index(connection: Connection, table: str, name: str) -> None:
+    existing = {index["name"] for index in inspect(connection).get_indexes(table)}
+    if name not in existing:
+        return
+    reflected = Table(table, MetaData(), autoload_with=connection)
+    next(index for index in reflected.indexes if index.name == name).drop(connection)
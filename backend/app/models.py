@@ -1,5 +1,6 @@
+import json
 import uuid
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, String, Text, func
+from sqlalchemy import BigInteger, Boolean, Column, DateTime, ForeignKey, Index, Integer, LargeBinary, String, Text, func
 from sqlalchemy.orm import relationship
 
 from .database import Base
@@ -21,6 +22,13 @@ class User(Base):
     announcements = relationship("Announcement", back_populates="author")
     courses = relationship("Course", back_populates="author")
 
+    __table_args__ = (
+        Index("ix_users_created_at_id", "created_at", "id"),
+        Index("ix_users_role_active_created_at_id", "role", "active", "created_at", "id"),
+        Index("ix_users_active_created_at_id", "active", "created_at", "id"),
+        Index("ix_users_name", "name"),
+    )
+
 
 class Announcement(Base):
     __tablename__ = "announcements"
@@ -37,6 +45,12 @@ class Announcement(Base):
 
     author = relationship("User", back_populates="announcements")
 
+    __table_args__ = (
+        Index("ix_announcements_published_at_id", "published_at", "id"),
+        # Portal visibility: equality on is_active, walk published_at in order, filter expires_at from the index.
+        Index("ix_announcements_visible", "is_active", "published_at", "id", "expires_at"),
+    )
+
     @property
     def author_name(self) -> str | None:
         return self.author.name if self.author else None
@@ -57,6 +71,11 @@ class Course(Base):
 
     author = relationship("User", back_populates="courses")
 
+    __table_args__ = (
+        Index("ix_courses_created_at_id", "created_at", "id"),
+        Index("ix_courses_is_active_created_at_id", "is_active", "created_at", "id"),
+    )
+
 
 class PortalLink(Base):
     __tablename__ = "portal_links"
@@ -83,3 +102,58 @@ class Partner(Base):
     is_active = Column(Boolean, default=True, nullable=False)
     created_at = Column(DateTime, server_default=func.now(), nullable=False)
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_partners_name_id", "name", "id"),
+        Index("ix_partners_is_active_name_id", "is_active", "name", "id"),
+    )
+
+
+class ImportJob(Base):
+    __tablename__ = "import_jobs"
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    kind = Column(String(20), nullable=False)
+    status = Column(String(20), nullable=False, default="queued")
+    requested_by = Column(String(36), nullable=True)
+    file_content = Column(LargeBinary(length=(2**32) - 1), nullable=True)
+    last_row = Column(Integer, nullable=False, default=1)
+    processed = Column(Integer, nullable=False, default=0)
+    created = Column(Integer, nullable=True)
+    deleted = Column(Integer, nullable=True)
+    skipped = Column(Integer, nullable=False, default=0)
+    errors_json = Column(Text(length=(2**32) - 1), nullable=False, default="[]")
+    detail = Column(String(255), nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    @property
+    def errors(self) -> list[dict[str, object]]:
+        return json.loads(self.errors_json or "[]")
+
+
+# One row per successful login, written in batches by app/logins.py. No foreign key: history
+# outlives deleted users and the inserts stay cheap.
+class LoginEvent(Base):
+    __tablename__ = "login_events"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    user_id = Column(String(36), nullable=False)
+    logged_in_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_login_events_logged_in_at", "logged_in_at"),
+        Index("ix_login_events_user_id_logged_in_at", "user_id", "logged_in_at"),
+    )
+
+
+# One row per cached content family ("portal", "users"). Admin writes bump the row in their own
+# transaction; every worker polls the table (app/coherence.py) to drop caches another process made stale.
+class ContentVersion(Base):
+    __tablename__ = "content_versions"
+
+    name = Column(String(32), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, server_default=func.now(), nullable=False)
@@ -0,0 +1,63 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable, Optional, Sequence, TypeVar
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Query
+
+T = TypeVar("T")
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([value.isoformat() if isinstance(value, datetime) else value for value in values])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], parsers: Sequence[Callable[[Any], Any]]) -> Optional[tuple]:
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, list) or len(values) != len(parsers):
+            raise ValueError(cursor)
+        return tuple(parser(value) for parser, value in zip(parsers, values))
+    except (ValueError, TypeError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido.") from exc
+
+
+def _comparable(query: Query, column: Any, value: Any) -> tuple[Any, Any]:
+    # SQLite stores CURRENT_TIMESTAMP defaults without fractional seconds while bound datetimes carry
+    # them, so the raw strings do not compare equal; julian day numbers do.
+    if isinstance(value, datetime) and query.session.get_bind().dialect.name == "sqlite":
+        return func.julianday(column), func.julianday(value)
+    return column, value
+
+
+def apply_keyset(query: Query, columns: Sequence[Any], descending: bool, after: Optional[tuple]) -> Query:
+    if after is not None:
+        # Expanded form of (a, b) < (x, y) so MySQL can range-scan the composite index.
+        pairs = [_comparable(query, column, value) for column, value in zip(columns, after)]
+        clauses = []
+        for position, (column, value) in enumerate(pairs):
+            equal = [pairs[index][0] == pairs[index][1] for index in range(position)]
+            beyond = column < value if descending else column > value
+            clauses.append(and_(*equal, beyond))
+        query = query.filter(or_(*clauses))
+    order = [column.desc() if descending else column.asc() for column in columns]
+    return query.order_by(*order)
+
+
+def paginate(response: Response, items: list[T], limit: int, key: Callable[[T], Sequence[Any]]) -> list[T]:
+    # Callers fetch limit + 1 rows; the extra row only signals that another page exists.
+    if len(items) <= limit:
+        return items
+    items = items[:limit]
+    response.headers[NEXT_CURSOR_HEADER] = encode_cursor(key(items[-1]))
+    return items
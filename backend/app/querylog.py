@@ -0,0 +1,120 @@
+import logging
+import re
+import threading
+import time
+from collections import deque
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .config import get_settings
+from .metrics import current_request
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+SAMPLES_PER_FINGERPRINT = 512
+MAX_FINGERPRINTS = 1000
+
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|%\(\w+\)s|\?|:\w+")
+_VALUE_LIST = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _PLACEHOLDER.sub("?", normalized)
+    # IN lists and multi-row VALUES differ only in arity; fold them into one fingerprint.
+    normalized = _VALUE_LIST.sub("(...)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+class _FingerprintStats:
+    __slots__ = ("count", "total", "max", "samples", "routes")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples: deque[float] = deque(maxlen=SAMPLES_PER_FINGERPRINT)
+        self.routes: set[str] = set()
+
+
+class QueryStats:
+    def __init__(self):
+        self._stats: dict[str, _FingerprintStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: str, elapsed: float, route: str) -> None:
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                if len(self._stats) >= MAX_FINGERPRINTS:
+                    return
+                stats = self._stats[key] = _FingerprintStats()
+            stats.count += 1
+            stats.total += elapsed
+            stats.max = max(stats.max, elapsed)
+            stats.samples.append(elapsed)
+            if len(stats.routes) < 20:
+                stats.routes.add(route)
+
+    def top(self, limit: int, sort: str = "total") -> list[dict[str, Any]]:
+        with self._lock:
+            rows = []
+            for key, stats in self._stats.items():
+                samples = sorted(stats.samples)
+                p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))] if samples else 0.0
+                rows.append(
+                    {
+                        "fingerprint": key,
+                        "count": stats.count,
+                        "total_ms": round(stats.total * 1000, 3),
+                        "mean_ms": round(stats.total / stats.count * 1000, 3),
+                        "p95_ms": round(p95 * 1000, 3),
+                        "max_ms": round(stats.max * 1000, 3),
+                        "routes": sorted(stats.routes),
+                    }
+                )
+        return sorted(rows, key=lambda row: row[f"{sort}_ms" if sort != "count" else "count"], reverse=True)[:limit]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+query_stats = QueryStats()
+
+
+def _current_route() -> str:
+    request = current_request()
+    if request is None:
+        return "background"
+    return f"{request.scope.get('method', '')} {request.route}"
+
+
+def install_query_log(engine: Engine) -> None:
+    threshold = settings.slow_query_threshold_ms / 1000
+
+    # Kept on the execution context rather than the connection, so a statement that raises (and never
+    # reaches after_cursor_execute) leaves nothing behind.
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._querylog_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_querylog_started", None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        route = _current_route()
+        query_stats.record(fingerprint(statement), elapsed, route)
+        if elapsed >= threshold:
+            logger.warning("Slow query (%.1f ms) on %s: %s", elapsed * 1000, route, _WHITESPACE.sub(" ", statement))
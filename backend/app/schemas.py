@@ -1,6 +1,7 @@
 from datetime import date, datetime
 from typing import Literal, Optional
 from pydantic import BaseModel, EmailStr
+from typing_extensions import TypedDict
 
 UserRole = Literal["admin", "socio"]
 
@@ -129,6 +130,61 @@ class PartnerPublic(PartnerBase):
         from_attributes = True
 
 
+# Plain-row shapes of the *Public schemas for list responses: same fields in the same order, so the
+# JSON is identical, but without EmailStr or model instances, so large pages stay in pydantic-core.
+class UserRow(TypedDict):
+    name: str
+    email: str
+    role: UserRole
+    id: str
+    active: bool
+    created_at: datetime
+
+
+class AnnouncementRow(TypedDict):
+    id: str
+    title: str
+    body: str
+    published_at: datetime
+    expires_at: Optional[datetime]
+    author_name: Optional[str]
+    created_at: datetime
+
+
+class CourseRow(TypedDict):
+    id: str
+    title: str
+    description: str
+    image_url: Optional[str]
+    access_url: str
+    created_at: datetime
+
+
+class PartnerRow(TypedDict):
+    name: str
+    description: str
+    link_url: str
+    logo_url: Optional[str]
+    id: str
+
+
+class PortalBootstrap(BaseModel):
+    user: UserPublic
+    announcements: list[AnnouncementPublic]
+    courses: list[CoursePublic]
+    links: list[PortalLinkPublic]
+    partners: list[PartnerPublic]
+
+
+class SearchResult(BaseModel):
+    kind: Literal["announcement", "course", "partner"]
+    id: str
+    title: str
+    snippet: str
+    date: Optional[datetime] = None
+    score: float
+
+
 class BulkUserError(BaseModel):
     row: int
     message: str
@@ -140,3 +196,21 @@ class BulkUserResult(BaseModel):
     deleted: Optional[int] = None
     skipped: int
     errors: list[BulkUserError] = []
+
+
+class ImportJobPublic(BulkUserResult):
+    id: str
+    kind: Literal["bulk-create", "bulk-delete"]
+    status: Literal["queued", "running", "done", "failed"]
+    detail: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class LoginDayPublic(BaseModel):
+    day: date
+    logins: int
+    users: int
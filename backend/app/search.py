@@ -0,0 +1,319 @@
+import bisect
+import heapq
+import math
+import re
+import threading
+import unicodedata
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, Literal, NamedTuple, Optional
+
+SearchKind = Literal["announcement", "course", "partner"]
+
+TITLE_WEIGHT = 3.0
+BODY_WEIGHT = 1.0
+# Age is measured from a fixed epoch so impacts never change and the ranked lists stay sorted.
+RECENCY_HALF_LIFE_SECONDS = 365 * 86400
+RECENCY_EPOCH = datetime(2024, 1, 1).timestamp()
+MAX_PREFIX_EXPANSION = 64
+# Rows stamped before a read can commit after it, so each sync re-reads this far back.
+SYNC_OVERLAP = timedelta(minutes=1)
+SNIPPET_LENGTH = 160
+
+STOPWORDS = frozenset(
+    "a ao aos as com da das de do dos e em na nas no nos o os ou para pela pelas pelo pelos por que se um uma".split()
+)
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def normalize(text: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text: str) -> list[str]:
+    return [token for token in _TOKEN.findall(normalize(text)) if len(token) > 1 and token not in STOPWORDS]
+
+
+class SearchDocument(NamedTuple):
+    kind: SearchKind
+    id: str
+    title: str
+    snippet: str
+    date: Optional[datetime]
+    published_at: Optional[datetime]
+    expires_at: Optional[datetime]
+    weights: dict[str, float]
+
+    def visible(self, now: datetime) -> bool:
+        if self.published_at is not None and self.published_at > now:
+            return False
+        return self.expires_at is None or self.expires_at >= now
+
+
+class SearchHit(NamedTuple):
+    document: SearchDocument
+    score: float
+
+
+def _recency(moment: Optional[datetime]) -> float:
+    return 2.0 ** (((moment.timestamp() if moment else RECENCY_EPOCH) - RECENCY_EPOCH) / RECENCY_HALF_LIFE_SECONDS)
+
+
+def make_document(
+    kind: SearchKind,
+    id: str,
+    title: str,
+    body: str,
+    date: Optional[datetime],
+    published_at: Optional[datetime] = None,
+    expires_at: Optional[datetime] = None,
+) -> SearchDocument:
+    term_counts: dict[str, float] = {}
+    for token in tokenize(title):
+        term_counts[token] = term_counts.get(token, 0.0) + TITLE_WEIGHT
+    for token in tokenize(body):
+        term_counts[token] = term_counts.get(token, 0.0) + BODY_WEIGHT
+    recency = _recency(date)
+    weights = {term: (1 + math.log(count)) * recency for term, count in term_counts.items()}
+    snippet = body if len(body) <= SNIPPET_LENGTH else body[:SNIPPET_LENGTH].rsplit(" ", 1)[0] + "…"
+    return SearchDocument(kind, id, title, snippet, date, published_at, expires_at, weights)
+
+
+class SearchIndex:
+    def __init__(self):
+        self._documents: dict[tuple[str, str], SearchDocument] = {}
+        self._postings: dict[str, dict[tuple[str, str], float]] = {}
+        self._ranked: dict[str, list[tuple[float, tuple[str, str]]]] = {}
+        self._terms: list[str] = []
+        self._lock = threading.Lock()
+        self._replay: list[tuple[str, object]] = []
+        self._readers = 0
+        self._stale_marks = 0
+        self._synced_marks = 0
+        self.loaded = False
+        self.read_at: Optional[datetime] = None
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def _add(self, document: SearchDocument, bulk: bool = False) -> None:
+        key = (document.kind, document.id)
+        self._discard(key)
+        self._documents[key] = document
+        for term, impact in document.weights.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                self._ranked[term] = []
+                if not bulk:
+                    bisect.insort(self._terms, term)
+            postings[key] = impact
+            if bulk:
+                self._ranked[term].append((-impact, key))
+            else:
+                bisect.insort(self._ranked[term], (-impact, key))
+
+    def _discard(self, key: tuple[str, str]) -> None:
+        document = self._documents.pop(key, None)
+        if document is None:
+            return
+        for term in document.weights:
+            impact = self._postings[term].pop(key)
+            ranked = self._ranked[term]
+            del ranked[bisect.bisect_left(ranked, (-impact, key))]
+            if not ranked:
+                del self._postings[term], self._ranked[term]
+                del self._terms[bisect.bisect_left(self._terms, term)]
+
+    def upsert(self, document: SearchDocument) -> None:
+        with self._lock:
+            if self._readers:
+                self._replay.append(("upsert", document))
+            if self.loaded:
+                self._add(document)
+
+    def remove(self, kind: SearchKind, id: str) -> None:
+        with self._lock:
+            if self._readers:
+                self._replay.append(("remove", (kind, id)))
+            if self.loaded:
+                self._discard((kind, id))
+
+    @property
+    def stale(self) -> bool:
+        return self._stale_marks != self._synced_marks
+
+    def mark_stale(self) -> None:
+        with self._lock:
+            self._stale_marks += 1
+
+    def begin_load(self) -> tuple[int, int]:
+        with self._lock:
+            self._readers += 1
+            return self._stale_marks, len(self._replay)
+
+    def begin_sync(self) -> Optional[tuple[int, int]]:
+        # One reader at a time: an older snapshot finishing last would restore superseded rows.
+        with self._lock:
+            if self._readers:
+                return None
+            self._readers += 1
+            return self._stale_marks, len(self._replay)
+
+    def _end_read(self, token: tuple[int, int], read_at: Optional[datetime], replay: bool) -> None:
+        marks, start = token
+        if replay:
+            for action, payload in self._replay[start:]:
+                if action == "upsert":
+                    self._add(payload)
+                else:
+                    self._discard(payload)
+            self._synced_marks = max(self._synced_marks, marks)
+            self.read_at = read_at
+        self._readers -= 1
+        if not self._readers:
+            self._replay = []
+
+    def finish_load(
+        self,
+        documents: Iterable[SearchDocument],
+        token: tuple[int, int],
+        read_at: Optional[datetime] = None,
+    ) -> None:
+        fresh = SearchIndex()
+        for document in documents:
+            fresh._add(document, bulk=True)
+        for ranked in fresh._ranked.values():
+            ranked.sort()
+        fresh._terms = sorted(fresh._postings)
+        with self._lock:
+            if self.loaded:
+                self._end_read(token, read_at, replay=False)
+                return
+            self._documents, self._postings = fresh._documents, fresh._postings
+            self._ranked, self._terms = fresh._ranked, fresh._terms
+            self.loaded = True
+            self._end_read(token, read_at, replay=True)
+
+    def finish_sync(
+        self,
+        changed: Iterable[SearchDocument],
+        live: dict[str, set[str]],
+        token: tuple[int, int],
+        read_at: Optional[datetime],
+    ) -> None:
+        changed = list(changed)
+        with self._lock:
+            for document in changed:
+                self._add(document)
+            for key in [key for key in self._documents if key[1] not in live.get(key[0], ())]:
+                self._discard(key)
+            self._end_read(token, read_at, replay=True)
+
+    def cancel_load(self) -> None:
+        with self._lock:
+            self._readers -= 1
+            if not self._readers:
+                self._replay = []
+
+    def _expand(self, token: str, prefix: bool) -> list[str]:
+        if not prefix:
+            return [token] if token in self._postings else []
+        start = bisect.bisect_left(self._terms, token)
+        terms = []
+        for term in self._terms[start:start + MAX_PREFIX_EXPANSION]:
+            if not term.startswith(token):
+                break
+            terms.append(term)
+        return terms
+
+    def _stream(self, terms: list[str], idfs: list[float]) -> Iterator[tuple[float, tuple[str, str]]]:
+        if len(terms) == 1:
+            idf = idfs[0]
+            return ((impact * idf, key) for impact, key in self._ranked[terms[0]])
+        return heapq.merge(
+            *(((impact * idf, key) for impact, key in self._ranked[term]) for term, idf in zip(terms, idfs))
+        )
+
+    def search(self, query: str, limit: int = 20, now: Optional[datetime] = None) -> list[SearchHit]:
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+        now = now or datetime.now()
+        with self._lock:
+            total = len(self._documents)
+            groups = []
+            for position, token in enumerate(tokens):
+                terms = self._expand(token, prefix=position == len(tokens) - 1)
+                if not terms:
+                    return []
+                groups.append((terms, [math.log(1 + total / len(self._postings[term])) for term in terms]))
+
+            lookups = [[(self._postings[term], idf) for term, idf in zip(terms, idfs)] for terms, idfs in groups]
+            streams = [self._stream(terms, idfs) for terms, idfs in groups]
+            frontier = [0.0] * len(streams)
+            seen: set[tuple[str, str]] = set()
+            best: list[tuple[float, tuple[str, str]]] = []
+            exhausted = False
+            while not exhausted:
+                for position, stream in enumerate(streams):
+                    entry = next(stream, None)
+                    if entry is None:
+                        exhausted = True
+                        break
+                    negative_score, key = entry
+                    frontier[position] = -negative_score
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    score = 0.0
+                    for lookup in lookups:
+                        contribution = 0.0
+                        for postings, idf in lookup:
+                            impact = postings.get(key)
+                            if impact is not None and impact * idf > contribution:
+                                contribution = impact * idf
+                        if not contribution:
+                            break
+                        score += contribution
+                    else:
+                        if not self._documents[key].visible(now):
+                            continue
+                        if len(best) < limit:
+                            heapq.heappush(best, (score, key))
+                        elif score > best[0][0]:
+                            heapq.heapreplace(best, (score, key))
+                if len(best) >= limit and best[0][0] >= sum(frontier):
+                    break
+            documents = [self._documents[key] for _, key in best]
+
+        scale = 1 / _recency(now)
+        return sorted(
+            (SearchHit(document, score * scale) for (score, _), document in zip(best, documents)),
+            key=lambda hit: hit.score,
+            reverse=True,
+        )
+
+
+search_index = SearchIndex()
+
+
+def announcement_document(item) -> SearchDocument:
+    return make_document("announcement", item.id, item.title, item.body, item.published_at, item.published_at, item.expires_at)
+
+
+def course_document(item) -> SearchDocument:
+    return make_document("course", item.id, item.title, item.description, item.created_at)
+
+
+def partner_document(item) -> SearchDocument:
+    return make_document("partner", item.id, item.name, item.description, item.created_at)
+
+
+def index_item(kind: SearchKind, item) -> None:
+    if not item.is_active:
+        search_index.remove(kind, item.id)
+        return
+    builder = {"announcement": announcement_document, "course": course_document, "partner": partner_document}[kind]
+    search_index.upsert(builder(item))
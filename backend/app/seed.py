@@ -2,7 +2,7 @@ from sqlalchemy.orm import Session
 
 from .config import get_settings
 from .models import PortalLink, User
-from .auth import hash_password
+from .hashing import hash_password
 
 settings = get_settings()
 
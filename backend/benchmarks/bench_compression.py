@@ -0,0 +1,138 @@
+"""CPU versus bytes for gzip and brotli on the payloads the API actually serves.
+
+Run from backend/:  python -m benchmarks.bench_compression --link-mbps 1
+
+Builds representative bodies with the app's own serializers (member bootstrap, announcement list with long
+bodies, admin user pages of 50/500/5000 rows, the CSV export and the XLSX template) and compresses each at
+several gzip levels and brotli qualities. For every combination it prints the compressed size, the CPU time
+per response (best of --repeats), and the transfer time saved on a --link-mbps connection, which is the
+number to weigh against the CPU cost when choosing COMPRESSION_GZIP_LEVEL / COMPRESSION_BROTLI_QUALITY.
+"""
+import argparse
+import io
+import time
+import uuid
+import zlib
+from datetime import datetime, timedelta
+
+import brotli
+
+GZIP_LEVELS = (1, 6, 9)
+BROTLI_QUALITIES = (1, 4, 6, 11)
+
+PARAGRAPH = (
+    "Informamos aos associados que o atendimento administrativo funcionará em horário especial durante o "
+    "período de atualização cadastral. Os plantões seguem a escala divulgada e as dúvidas podem ser enviadas "
+    "pelos canais oficiais da cooperativa. "
+)
+
+
+def payloads() -> dict[str, bytes]:
+    from openpyxl import Workbook
+
+    from app.bulk import CREATE_TEMPLATE_COLUMNS
+    from app.crud import announcements_json, courses_json, partners_json, users_json
+
+    now = datetime(2026, 1, 1)
+
+    def users(count: int) -> list[dict]:
+        return [
+            {
+                "name": f"Sócio Exemplo {index}",
+                "email": f"socio.exemplo{index}@example.com",
+                "role": "socio",
+                "id": str(uuid.uuid4()),
+                "active": True,
+                "created_at": now - timedelta(minutes=index),
+            }
+            for index in range(count)
+        ]
+
+    announcements = [
+        {
+            "id": str(uuid.uuid4()),
+            "title": f"Comunicado importante {index}",
+            "body": PARAGRAPH * 6,
+            "published_at": now - timedelta(days=index),
+            "expires_at": now + timedelta(days=30),
+            "author_name": "Administrador",
+            "created_at": now - timedelta(days=index),
+        }
+        for index in range(30)
+    ]
+    courses = [
+        {
+            "id": str(uuid.uuid4()),
+            "title": f"Curso de atualização {index}",
+            "description": PARAGRAPH,
+            "image_url": f"https://souarteemcuidados.com.br/cursos/{index}.jpg",
+            "access_url": "https://example.com/curso",
+            "created_at": now,
+        }
+        for index in range(12)
+    ]
+    partners = [
+        {"name": f"Parceiro {index}", "description": PARAGRAPH, "link_url": "https://example.com", "logo_url": None, "id": str(uuid.uuid4())}
+        for index in range(10)
+    ]
+    bootstrap = (
+        b'{"announcements":' + announcements_json(announcements)
+        + b',"courses":' + courses_json(courses)
+        + b',"partners":' + partners_json(partners) + b"}"
+    )
+
+    csv_rows = users(5000)
+    csv_body = ("﻿nome,email,senha,perfil\n" + "".join(f"{row['name']},{row['email']},,{row['role']}\n" for row in csv_rows)).encode("utf-8")
+
+    workbook = Workbook()
+    workbook.active.append(CREATE_TEMPLATE_COLUMNS)
+    template = io.BytesIO()
+    workbook.save(template)
+
+    return {
+        "portal bootstrap": bootstrap,
+        "announcements (30)": announcements_json(announcements),
+        "admin users (50)": users_json(users(50)),
+        "admin users (500)": users_json(users(500)),
+        "admin users (5000)": users_json(users(5000)),
+        "users export csv (5000)": csv_body,
+        "xlsx template": template.getvalue(),
+    }
+
+
+def best_of(repeats: int, run) -> tuple[float, bytes]:
+    best, output = float("inf"), b""
+    for _ in range(repeats):
+        started = time.perf_counter()
+        output = run()
+        best = min(best, time.perf_counter() - started)
+    return best, output
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--link-mbps", type=float, default=1.0)
+    args = parser.parse_args()
+    bytes_per_second = args.link_mbps * 1_000_000 / 8
+
+    for name, body in payloads().items():
+        print(f"{name}: {len(body):,} bytes identity ({len(body) / bytes_per_second * 1000:.0f} ms at {args.link_mbps:g} Mbps)")
+        codecs = [(f"gzip-{level}", lambda level=level: _gzip(body, level)) for level in GZIP_LEVELS]
+        codecs += [(f"br-{quality}", lambda quality=quality: brotli.compress(body, quality=quality)) for quality in BROTLI_QUALITIES]
+        for label, run in codecs:
+            elapsed, output = best_of(args.repeats, run)
+            saved_ms = (len(body) - len(output)) / bytes_per_second * 1000
+            print(
+                f"    {label:<8} {len(output):>10,} bytes  ratio {len(body) / len(output):>5.1f}  "
+                f"cpu {elapsed * 1000:>8.2f} ms  transfer saved {saved_ms:>8.0f} ms"
+            )
+
+
+def _gzip(body: bytes, level: int) -> bytes:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return compressor.compress(body) + compressor.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""Throughput and latency of the API endpoints against a local SQLite database.
+
+Run from backend/:  python -m benchmarks.bench_endpoints --sizes 100,1000,10000 --output bench.json
+
+Boots app.main:app in-process (TestClient, so startup and shutdown hooks run) on the SQLite URL given by
+--database-url, which is passed through Settings.database_url. For each size the schema is rebuilt and
+seeded with that many members plus a tenth as many announcements, courses and partners; every endpoint is
+then hit --requests times (--login-requests for login) from --concurrency threads, and bulk create/delete
+import a spreadsheet with that many rows. Results go to --output as JSON, keyed by size and endpoint, so two
+runs can be diffed between commits. --bcrypt-rounds sets PASSWORD_HASH_ROUNDS for the run; the default
+keeps 10k-row imports within minutes and is recorded in the output, since it dominates login and bulk create.
+"""
+import argparse
+import io
+import json
+import math
+import os
+import platform
+import sqlite3
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable
+
+MEMBER_PASSWORD = "benchmark"
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(0, math.ceil(fraction * len(sorted_values)) - 1)]
+
+
+def measure(call: Callable, requests: int, concurrency: int) -> dict:
+    def one(_):
+        started = time.perf_counter()
+        response = call()
+        return time.perf_counter() - started, response.status_code
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = list(pool.map(one, range(requests)))
+    wall = time.perf_counter() - started
+
+    latencies = sorted(elapsed for elapsed, _ in samples)
+    return {
+        "requests": requests,
+        "errors": sum(1 for _, code in samples if code >= 400),
+        "throughput_rps": round(requests / wall, 2),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+    }
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="100,1000,10000")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--login-requests", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--bcrypt-rounds", type=int, default=4)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--no-cache", action="store_true", help="disable the portal response cache")
+    parser.add_argument("--output", default="bench-endpoints.json")
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    database_url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='souarte-bench-'), 'bench.db')}"
+    os.environ["DATABASE_URL"] = database_url
+    os.environ["PASSWORD_HASH_ROUNDS"] = str(args.bcrypt_rounds)
+    if args.no_cache:
+        os.environ["PORTAL_CACHE_TTL_SECONDS"] = "0"
+
+    from fastapi.testclient import TestClient
+    from openpyxl import Workbook
+
+    from app import crud, models
+    from app.auth import create_access_token
+    from app.config import get_settings
+    from app.database import Base, SessionLocal, engine
+    from app.hashing import hash_password
+    from app.main import app
+    from app.migrate import schema_version
+
+    settings = get_settings()
+
+    def seed(size: int) -> tuple[str, str]:
+        content = max(10, size // 10)
+        now = datetime.now()
+        password_hash = hash_password(MEMBER_PASSWORD)
+        with SessionLocal() as db:
+            admin = db.query(models.User).filter(models.User.email == settings.admin_email).one()
+            db.add_all(
+                models.User(name=f"Sócio {index}", email=f"socio{index}@example.com", password_hash=password_hash, role="socio")
+                for index in range(size)
+            )
+            db.add_all(
+                models.Announcement(
+                    title=f"Comunicado {index}",
+                    body="Texto do comunicado.",
+                    published_at=now - timedelta(hours=index),
+                    expires_at=now + timedelta(days=30) if index % 4 else None,
+                    created_by=admin.id,
+                )
+                for index in range(content)
+            )
+            db.add_all(
+                models.Course(title=f"Curso {index}", description="Descrição", access_url="https://example.com", created_by=admin.id)
+                for index in range(content)
+            )
+            db.add_all(
+                models.Partner(name=f"Parceiro {index:05d}", description="Descrição", link_url="https://example.com")
+                for index in range(content)
+            )
+            db.commit()
+            member_id = db.query(models.User.id).filter(models.User.email == "socio0@example.com").scalar()
+            admin_id = admin.id
+            # Fixtures bypass crud, so drop anything cached from the previous size.
+            crud.invalidate_portal_cache(db)
+        return admin_id, member_id
+
+    def spreadsheet(rows: list[list[str]]) -> bytes:
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet()
+        for row in rows:
+            sheet.append(row)
+        buffer = io.BytesIO()
+        workbook.save(buffer)
+        return buffer.getvalue()
+
+    def run_job(client: TestClient, path: str, content: bytes, cookie: dict, rows: int) -> dict:
+        started = time.perf_counter()
+        response = client.post(path, files={"file": ("bench.xlsx", content)}, headers=cookie)
+        job = response.json()
+        while job.get("status") in ("queued", "running"):
+            time.sleep(0.05)
+            job = client.get(f"/admin/jobs/{job['id']}", headers=cookie).json()
+        elapsed = time.perf_counter() - started
+        return {
+            "rows": rows,
+            "status": job.get("status"),
+            "errors": job.get("skipped"),
+            "seconds": round(elapsed, 3),
+            "rows_per_second": round(rows / elapsed, 2),
+        }
+
+    results: dict[str, dict] = {}
+    for size in sizes:
+        Base.metadata.drop_all(bind=engine)
+        schema_version.drop(bind=engine, checkfirst=True)
+        # Entering the client runs startup, which migrates the empty database and seeds the admin.
+        with TestClient(app) as client:
+            admin_id, member_id = seed(size)
+            admin = {"Cookie": f"{settings.cookie_name}={create_access_token(admin_id)}"}
+            member = {"Cookie": f"{settings.cookie_name}={create_access_token(member_id)}"}
+            credentials = {"email": "socio0@example.com", "password": MEMBER_PASSWORD}
+
+            def get(path: str, headers: dict) -> Callable:
+                return lambda: client.get(path, headers=headers)
+
+            endpoints = {
+                "auth_me": get("/auth/me", member),
+                "portal_bootstrap": get("/portal/bootstrap", member),
+                "portal_announcements": get("/portal/announcements", member),
+                "portal_courses": get("/portal/courses", member),
+                "portal_links": get("/portal/links", member),
+                "portal_link": get("/portal/links/plantao", member),
+                "portal_partners": get("/portal/partners", member),
+                "admin_users_page": get("/admin/users?limit=50", admin),
+                "admin_users_max_page": get("/admin/users?limit=500", admin),
+                "admin_announcements": get("/admin/announcements", admin),
+                "admin_courses": get("/admin/courses", admin),
+                "admin_partners": get("/admin/partners", admin),
+            }
+
+            size_results = {
+                "login": measure(lambda: client.post("/auth/login", json=credentials), args.login_requests, args.concurrency)
+            }
+            # Login stores the cookie on the client; the remaining calls authenticate explicitly.
+            client.cookies.clear()
+            for name, call in endpoints.items():
+                call()
+                size_results[name] = measure(call, args.requests, args.concurrency)
+
+            emails = [f"import{index}@example.com" for index in range(size)]
+            create_rows = [["nome", "email", "senha", "perfil"]] + [[f"Importado {index}", email, MEMBER_PASSWORD, "socio"] for index, email in enumerate(emails)]
+            size_results["bulk_create"] = run_job(client, "/admin/users/bulk-create", spreadsheet(create_rows), admin, size)
+            delete_rows = [["email"]] + [[email] for email in emails]
+            size_results["bulk_delete"] = run_job(client, "/admin/users/bulk-delete", spreadsheet(delete_rows), admin, size)
+
+        results[str(size)] = size_results
+        for name, stats in size_results.items():
+            if "p50_ms" in stats:
+                print(
+                    f"size={size:<6} {name:<22} {stats['throughput_rps']:>9.1f} req/s  "
+                    f"p50={stats['p50_ms']:>8.2f} ms  p99={stats['p99_ms']:>8.2f} ms  errors={stats['errors']}"
+                )
+            else:
+                print(f"size={size:<6} {name:<22} {stats['rows_per_second']:>9.1f} rows/s  {stats['seconds']:.2f} s  status={stats['status']}")
+
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "database_url": database_url,
+            "requests": args.requests,
+            "login_requests": args.login_requests,
+            "concurrency": args.concurrency,
+            "bcrypt_rounds": args.bcrypt_rounds,
+            "portal_cache": not args.no_cache,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
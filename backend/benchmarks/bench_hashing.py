@@ -0,0 +1,60 @@
+"""Throughput of bcrypt hashing as the process pool grows.
+
+Run from backend/:  python -m benchmarks.bench_hashing --passwords 64 --workers 1,2,4,8
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from app.hashing import hash_password
+
+
+def run(passwords: list[str], workers: int) -> dict[str, float]:
+    if workers <= 1:
+        started = time.perf_counter()
+        for password in passwords:
+            hash_password(password)
+        elapsed = time.perf_counter() - started
+    else:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            # Warm the pool so process start-up is not billed to the measurement.
+            list(executor.map(hash_password, ["warmup"] * workers))
+            chunksize = max(1, len(passwords) // (workers * 4))
+            started = time.perf_counter()
+            list(executor.map(hash_password, passwords, chunksize=chunksize))
+            elapsed = time.perf_counter() - started
+    return {
+        "workers": workers,
+        "passwords": len(passwords),
+        "seconds": round(elapsed, 4),
+        "hashes_per_second": round(len(passwords) / elapsed, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--passwords", type=int, default=64)
+    default_workers = ",".join(str(n) for n in (1, 2, 4, 8) if n <= (os.cpu_count() or 1)) or "1"
+    parser.add_argument("--workers", default=default_workers)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    passwords = [f"senha-{index}" for index in range(args.passwords)]
+    results = [run(passwords, int(workers)) for workers in args.workers.split(",")]
+    baseline = results[0]["hashes_per_second"]
+    for result in results:
+        result["speedup"] = round(result["hashes_per_second"] / baseline, 2)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'workers':>8} {'hashes/s':>10} {'speedup':>8}")
+    for result in results:
+        print(f"{result['workers']:>8} {result['hashes_per_second']:>10} {result['speedup']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Fetch-and-serialize cost of the admin list responses: ORM + response_model versus row projection.
+
+Run from backend/:  python -m benchmarks.bench_list_serialization --rows 1000,50000
+
+For each size, seeds a temporary SQLite database with that many users and announcements and times, per list:
+  orm   ORM objects validated into the *Public response_model (from_attributes), rendered by JSONResponse,
+        which is what FastAPI did for these endpoints before
+  rows  crud.list_* column projection into dicts, validated by the *Row TypeAdapter and encoded by
+        pydantic-core (crud.*_json), which is what the endpoints return now
+  orjson  the same rows encoded by orjson without validation, if orjson is installed, as a floor
+Both real paths produce the same bytes; the script checks that before timing.
+"""
+import argparse
+import os
+import tempfile
+import time
+from typing import Callable
+
+
+def best_of(repeats: int, run: Callable[[], bytes]) -> float:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", default="1000,50000")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="souarte-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+
+    from datetime import datetime, timedelta
+
+    from pydantic import TypeAdapter
+    from sqlalchemy import delete
+    from sqlalchemy.orm import joinedload
+    from starlette.responses import JSONResponse
+
+    from app import crud, models
+    from app.database import SessionLocal, engine
+    from app.migrate import apply_migrations
+    from app.schemas import AnnouncementPublic, UserPublic
+
+    try:
+        import orjson
+    except ImportError:
+        orjson = None
+
+    apply_migrations(engine)
+    users_adapter = TypeAdapter(list[UserPublic])
+    announcements_adapter = TypeAdapter(list[AnnouncementPublic])
+
+    def response_model_body(adapter: TypeAdapter, items: list) -> bytes:
+        return JSONResponse(adapter.dump_python(adapter.validate_python(items, from_attributes=True), mode="json")).body
+
+    for rows in [int(value) for value in args.rows.split(",")]:
+        with SessionLocal() as db:
+            db.execute(delete(models.Announcement))
+            db.execute(delete(models.User))
+            author = models.User(name="Autor", email="autor@example.com", password_hash="x", role="admin")
+            db.add(author)
+            db.flush()
+            db.add_all(
+                models.User(name=f"Sócio {index}", email=f"socio{index}@example.com", password_hash="x", role="socio")
+                for index in range(rows - 1)
+            )
+            now = datetime.now()
+            db.add_all(
+                models.Announcement(
+                    title=f"Comunicado {index}",
+                    body="Texto do comunicado com alguns parágrafos de conteúdo.",
+                    published_at=now - timedelta(minutes=index),
+                    expires_at=now + timedelta(days=30),
+                    created_by=author.id,
+                )
+                for index in range(rows)
+            )
+            db.commit()
+
+        def orm_users() -> bytes:
+            with SessionLocal() as db:
+                items = db.query(models.User).order_by(models.User.created_at.desc(), models.User.id.desc()).all()
+                return response_model_body(users_adapter, items)
+
+        def orm_announcements() -> bytes:
+            with SessionLocal() as db:
+                items = (
+                    db.query(models.Announcement)
+                    .options(joinedload(models.Announcement.author))
+                    .order_by(models.Announcement.published_at.desc(), models.Announcement.id.desc())
+                    .all()
+                )
+                return response_model_body(announcements_adapter, items)
+
+        def rows_users() -> bytes:
+            with SessionLocal() as db:
+                return crud.users_json(crud.list_users(db))
+
+        def rows_announcements() -> bytes:
+            with SessionLocal() as db:
+                return crud.announcements_json(crud.list_announcements(db))
+
+        cases = {
+            "users": {"orm": orm_users, "rows": rows_users},
+            "announcements": {"orm": orm_announcements, "rows": rows_announcements},
+        }
+        if orjson is not None:
+
+            def orjson_users() -> bytes:
+                with SessionLocal() as db:
+                    return orjson.dumps(crud.list_users(db))
+
+            def orjson_announcements() -> bytes:
+                with SessionLocal() as db:
+                    return orjson.dumps(crud.list_announcements(db))
+
+            cases["users"]["orjson"] = orjson_users
+            cases["announcements"]["orjson"] = orjson_announcements
+
+        for name, paths in cases.items():
+            if paths["orm"]() != paths["rows"]():
+                raise SystemExit(f"{name}: row projection output differs from the response_model output")
+            baseline = best_of(args.repeats, paths["orm"])
+            for label, run in paths.items():
+                elapsed = baseline if label == "orm" else best_of(args.repeats, run)
+                print(
+                    f"{name:<14} rows={rows:<7} {label:<7} {elapsed * 1000:>9.1f} ms  "
+                    f"{rows / elapsed:>10.0f} rows/s  x{baseline / elapsed:.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
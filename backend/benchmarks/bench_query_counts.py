@@ -0,0 +1,83 @@
+"""Statement count for the announcement list paths, to catch N+1 regressions.
+
+Run from backend/:  python -m benchmarks.bench_query_counts --rows 200
+Exits with status 1 if listing N announcements issues more than a constant number of statements.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+
+MAX_STATEMENTS = 2
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="souarte-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ["PORTAL_CACHE_TTL_SECONDS"] = "0"
+
+    from datetime import datetime, timedelta
+
+    from sqlalchemy import event
+
+    from app import crud, models
+    from app.database import AsyncSessionLocal, Base, SessionLocal, async_engine, engine
+
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        authors = [
+            models.User(name=f"Autor {index}", email=f"autor{index}@example.com", password_hash="x", role="admin")
+            for index in range(args.rows)
+        ]
+        db.add_all(authors)
+        db.flush()
+        now = datetime.now()
+        db.add_all(
+            models.Announcement(
+                title=f"Comunicado {index}",
+                body="Texto",
+                published_at=now - timedelta(days=index),
+                expires_at=now + timedelta(days=30),
+                created_by=authors[index].id,
+            )
+            for index in range(args.rows)
+        )
+        db.commit()
+
+    statements: list[str] = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count)
+
+    results = {}
+    with SessionLocal() as db:
+        statements.clear()
+        [item["author_name"] for item in crud.list_announcements(db)]
+        results["list_announcements + author_name"] = len(statements)
+
+    async def run_async() -> int:
+        async with AsyncSessionLocal() as db:
+            statements.clear()
+            await crud.portal_announcements_json_async(db)
+            return len(statements)
+
+    results["portal_announcements_json_async"] = asyncio.run(run_async())
+
+    failed = False
+    for name, total in results.items():
+        status = "ok" if total <= MAX_STATEMENTS else "FAIL"
+        failed = failed or total > MAX_STATEMENTS
+        print(f"{name:<36} rows={args.rows:<6} statements={total:<4} {status}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
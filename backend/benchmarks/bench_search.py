@@ -0,0 +1,104 @@
+"""Build time, memory footprint and query latency of the in-memory portal search index.
+
+Run from backend/:  python -m benchmarks.bench_search --documents 10000,50000
+
+For each size, builds a synthetic corpus of announcements, courses and partners from a Portuguese vocabulary
+(accented, with a Zipf-like word distribution so common words have long posting lists) and reports:
+  build    time to index the whole corpus, which is what the first /portal/search pays once per worker
+  upsert   mean time of an incremental update, which is what each admin create/update adds
+  queries  p50 / p99 latency over single words, two-word AND queries, typed-so-far prefixes and misses
+"""
+import argparse
+import random
+import statistics
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+WORDS = (
+    "reunião assembleia associados cooperativa plantão escala atendimento cuidados paliativos enfermagem "
+    "formação curso atualização cadastro convênio parceiro desconto farmácia clínica hospital médico "
+    "residência inscrição prazo edital eleição diretoria conselho fiscal balanço orçamento contribuição "
+    "anuidade benefício seguro saúde odontologia psicologia fisioterapia nutrição pediatria geriatria "
+    "oncologia cardiologia urgência emergência domiciliar acolhimento família paciente equipe protocolo "
+    "capacitação workshop palestra seminário congresso certificado carga horária módulo aula online "
+    "presencial vagas abertas encerradas comunicado importante aviso horário especial feriado recesso"
+).split()
+
+QUERIES = (
+    ["reunião", "cuidados", "farmacia", "geriatria", "certificado", "orcamento"]
+    + ["cuidados paliativos", "curso online", "assembleia diretoria", "plantao escala"]
+    + ["reun", "paliat", "capac", "cuidados pali"]
+    + ["inexistente", "zzzz"]
+)
+
+
+def corpus(size: int, rng: random.Random):
+    from app.search import make_document
+
+    weights = [1 / (rank + 1) for rank in range(len(WORDS))]
+    now = datetime.now()
+
+    def text(words: int) -> str:
+        return " ".join(rng.choices(WORDS, weights, k=words))
+
+    for index in range(size):
+        kind = ("announcement", "course", "partner")[index % 3]
+        date = now - timedelta(days=rng.randint(0, 720))
+        expires_at = now + timedelta(days=30) if kind == "announcement" else None
+        yield make_document(kind, f"{kind}-{index}", text(5).capitalize(), text(60), date, date, expires_at)
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--documents", default="10000,50000")
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    from app.search import SearchIndex, make_document
+
+    for size in [int(value) for value in args.documents.split(",")]:
+        rng = random.Random(size)
+        documents = list(corpus(size, rng))
+        index = SearchIndex()
+
+        started = time.perf_counter()
+        index.finish_load(documents, index.begin_load())
+        build = time.perf_counter() - started
+
+        # Measured on a second build, since tracing allocations slows the timed one several times over.
+        tracemalloc.start()
+        shadow = SearchIndex()
+        shadow.finish_load(documents, shadow.begin_load())
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del shadow
+
+        started = time.perf_counter()
+        for document in documents[:500]:
+            index.upsert(make_document(document.kind, document.id, document.title, "texto revisado", document.date))
+        upsert = (time.perf_counter() - started) / 500
+
+        print(
+            f"documents={size:<7} build {build * 1000:>8.0f} ms  index ~{memory / 1_048_576:>6.1f} MiB  "
+            f"upsert {upsert * 1_000_000:>6.0f} µs"
+        )
+        for query in QUERIES:
+            timings = []
+            for _ in range(args.rounds):
+                started = time.perf_counter()
+                hits = index.search(query, 20)
+                timings.append(time.perf_counter() - started)
+            print(
+                f"    {query!r:<26} hits {len(hits):>3}  p50 {statistics.median(timings) * 1000:>7.3f} ms  "
+                f"p99 {percentile(timings, 0.99) * 1000:>7.3f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
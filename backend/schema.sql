@@ -10,6 +10,11 @@ CREATE TABLE users (
   last_login_at DATETIME NULL
 );
 
+CREATE INDEX ix_users_created_at_id ON users (created_at, id);
+CREATE INDEX ix_users_role_active_created_at_id ON users (role, active, created_at, id);
+CREATE INDEX ix_users_active_created_at_id ON users (active, created_at, id);
+CREATE INDEX ix_users_name ON users (name);
+
 CREATE TABLE announcements (
   id CHAR(36) PRIMARY KEY,
   title VARCHAR(200) NOT NULL,
@@ -23,6 +28,9 @@ CREATE TABLE announcements (
   CONSTRAINT fk_announcements_user FOREIGN KEY (created_by) REFERENCES users(id)
 );
 
+CREATE INDEX ix_announcements_published_at_id ON announcements (published_at, id);
+CREATE INDEX ix_announcements_visible ON announcements (is_active, published_at, id, expires_at);
+
 CREATE TABLE courses (
   id CHAR(36) PRIMARY KEY,
   title VARCHAR(200) NOT NULL,
@@ -36,6 +44,9 @@ CREATE TABLE courses (
   CONSTRAINT fk_courses_user FOREIGN KEY (created_by) REFERENCES users(id)
 );
 
+CREATE INDEX ix_courses_created_at_id ON courses (created_at, id);
+CREATE INDEX ix_courses_is_active_created_at_id ON courses (is_active, created_at, id);
+
 CREATE TABLE portal_links (
   id CHAR(36) PRIMARY KEY,
   slug VARCHAR(50) NOT NULL UNIQUE,
@@ -58,3 +69,50 @@ CREATE TABLE partners (
   created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
   updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
 );
+
+CREATE INDEX ix_partners_name_id ON partners (name, id);
+CREATE INDEX ix_partners_is_active_name_id ON partners (is_active, name, id);
+
+CREATE TABLE import_jobs (
+  id CHAR(36) PRIMARY KEY,
+  kind VARCHAR(20) NOT NULL,
+  status VARCHAR(20) NOT NULL,
+  requested_by CHAR(36) NULL,
+  file_content LONGBLOB NULL,
+  last_row INT NOT NULL DEFAULT 1,
+  processed INT NOT NULL DEFAULT 0,
+  created INT NULL,
+  deleted INT NULL,
+  skipped INT NOT NULL DEFAULT 0,
+  errors_json LONGTEXT NOT NULL,
+  detail VARCHAR(255) NULL,
+  heartbeat_at DATETIME NULL,
+  finished_at DATETIME NULL,
+  created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
+CREATE TABLE login_events (
+  id BIGINT AUTO_INCREMENT PRIMARY KEY,
+  user_id CHAR(36) NOT NULL,
+  logged_in_at DATETIME NOT NULL
+);
+
+CREATE INDEX ix_login_events_logged_in_at ON login_events (logged_in_at);
+CREATE INDEX ix_login_events_user_id_logged_in_at ON login_events (user_id, logged_in_at);
+
+-- Bumped by every admin write; each API worker polls it to drop caches made stale by another process.
+CREATE TABLE content_versions (
+  name VARCHAR(32) PRIMARY KEY,
+  version BIGINT NOT NULL DEFAULT 0,
+  updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO content_versions (name, version) VALUES ('portal', 0), ('users', 0);
+
+-- Managed by app/migrate.py: one row per migration applied (python -m app.migrate).
+CREATE TABLE schema_version (
+  version INT PRIMARY KEY,
+  name VARCHAR(100) NOT NULL,
+  applied_at DATETIME NOT NULL
+);
@@ -2,7 +2,9 @@ const API_BASE = process.env.NEXT_PUBLIC_API_BASE_URL ?? "http://localhost:8000"
 
 type ApiError = { detail?: string; message?: string } | null;
 
-export async function apiFetch<T>(path: string, options: RequestInit = {}): Promise<T> {
+export type Page<T> = { items: T[]; nextCursor: string | null };
+
+async function apiRequest(path: string, options: RequestInit = {}): Promise<Response> {
   const isFormData = typeof FormData !== "undefined" && options.body instanceof FormData;
   const headers = new Headers(options.headers ?? {});
   if (!isFormData && !headers.has("Content-Type")) {
@@ -26,9 +28,24 @@ export async function apiFetch<T>(path: string, options: RequestInit = {}): Prom
     throw new Error(message);
   }
 
+  return response;
+}
+
+export async function apiFetch<T>(path: string, options: RequestInit = {}): Promise<T> {
+  const response = await apiRequest(path, options);
+
   if (response.status === 204) {
     return {} as T;
   }
 
   return response.json() as Promise<T>;
 }
+
+// Admin listings are paginated by the API; the next page is requested with the X-Next-Cursor value.
+export async function apiFetchPage<T>(path: string, cursor: string | null = null): Promise<Page<T>> {
+  const separator = path.includes("?") ? "&" : "?";
+  const url = cursor ? `${path}${separator}cursor=${encodeURIComponent(cursor)}` : path;
+  const response = await apiRequest(url);
+  const items = (await response.json()) as T[];
+  return { items, nextCursor: response.headers.get("X-Next-Cursor") };
+}
@@ -44,3 +44,11 @@ export type PortalLink = {
   body: string;
   link_url: string;
 };
+
+export type PortalBootstrap = {
+  user: User;
+  announcements: Announcement[];
+  courses: Course[];
+  links: PortalLink[];
+  partners: Partner[];
+};